@@ -5,14 +5,15 @@ import json
 import logging
 import re
 import sys
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from dateutil.parser import parse as dtparse
 
+import orjson
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -28,14 +29,30 @@ URL = "https://annuaireci.com/pharmacies-de-garde/"
 
 CACHE_DIR = Path(__file__).resolve().parent / ".cache"
 
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+    ),
+    "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.6",
+}
+
 WEEK_RE = re.compile(
     r"Semaine\s+du\s+(\d{2}/\d{2}/\d{4})\s+au\s+(\d{2}/\d{2}/\d{4})", re.I
 )
 PHONE_LIKE_RE = re.compile(r"\d{2}(?:[\s.-]?\d{2}){3,}")  # ex: 07 69 35 39 09
+PHONE_SPLIT_RE = re.compile(r"[\/|,;]")                   # séparateurs entre numéros
+# Octets à supprimer pour ne garder que les chiffres ASCII (bytes.translate)
+NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+ANCHOR_RE = re.compile(r"Liste\s+des\s+pharmacies\s+de\s+garde", re.I)
+
+# Parser HTML : lxml (extension C) si disponible, sinon html.parser (pur Python)
+HTML_PARSER = "lxml"
 
 # Balises que l'on inspecte lors du parcours DOM
-HEADING_TAGS = {"h2", "h3", "h4"}
-CONTENT_TAGS = {"p", "div", "span", "li", "ul", "ol", "address", "strong", "em", "a"}
+HEADING_TAGS = frozenset({"h2", "h3", "h4"})
+CONTENT_TAGS = frozenset({"p", "div", "span", "li", "ul", "ol", "address", "strong", "em", "a"})
+CONTENT_OR_HEADING_TAGS = HEADING_TAGS | CONTENT_TAGS
 
 # Titres qui signalent la fin de la section pharmacies de garde
 STOP_TITLES = frozenset(
@@ -48,14 +65,13 @@ STOP_TITLES = frozenset(
     }
 )
 
+# Caractères typiques d'un UTF-8 décodé à tort en GBK (mojibake "é" → "茅", etc.)
+MOJIBAKE_CHARS = frozenset("茅猫脟掳鈥")
+
 # Éléments structurels attendus sur la page (pour le monitoring)
 EXPECTED_MARKERS = [
     ("week_range", WEEK_RE, "Période 'Semaine du … au …' introuvable"),
-    (
-        "anchor",
-        re.compile(r"Liste\s+des\s+pharmacies\s+de\s+garde", re.I),
-        "Ancre 'Liste des pharmacies de garde' introuvable",
-    ),
+    ("anchor", ANCHOR_RE, "Ancre 'Liste des pharmacies de garde' introuvable"),
 ]
 
 
@@ -66,12 +82,28 @@ class ScrapingStructureError(Exception):
     """La structure HTML attendue n'est plus trouvée sur la page."""
 
 
+# ---------------------------------------------------------------------------
+# Construction du DOM
+# ---------------------------------------------------------------------------
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse le HTML avec lxml, repli sur html.parser si lxml est absent."""
+    try:
+        return BeautifulSoup(html, features=HTML_PARSER)
+    except FeatureNotFound:
+        logger.debug("Parser '%s' indisponible, repli sur html.parser", HTML_PARSER)
+        return BeautifulSoup(html, "html.parser")
+
+
 # ---------------------------------------------------------------------------
 # Monitoring / validation de la structure HTML
 # ---------------------------------------------------------------------------
-def validate_html_structure(html: str) -> List[str]:
+def validate_html_structure(
+    html: str,
+    soup: Optional[BeautifulSoup] = None,
+) -> List[str]:
     """Vérifie que les marqueurs structurels attendus sont présents.
 
+    Si `soup` est fourni (DOM déjà construit), le HTML n'est pas re-parsé.
     Retourne une liste de messages d'alerte (vide = tout est OK).
     """
     alerts: List[str] = []
@@ -79,9 +111,15 @@ def validate_html_structure(html: str) -> List[str]:
         if not pattern.search(html):
             alerts.append(f"[STRUCTURE] {marker_name}: {message}")
     # Vérifier la présence de balises h3/h4 (zones + pharmacies)
-    soup = BeautifulSoup(html, "html.parser")
-    h3_count = len(soup.find_all("h3"))
-    h4_count = len(soup.find_all("h4"))
+    if soup is None:
+        soup = make_soup(html)
+    # Un seul parcours de l'arbre pour compter h3 et h4
+    h3_count = h4_count = 0
+    for tag in soup.find_all(["h3", "h4"]):
+        if tag.name == "h3":
+            h3_count += 1
+        else:
+            h4_count += 1
     if h3_count == 0:
         alerts.append("[STRUCTURE] Aucune balise <h3> trouvée (zones géographiques)")
     if h4_count == 0:
@@ -93,7 +131,7 @@ def validate_html_structure(html: str) -> List[str]:
 # HTTP : retry + cache
 # ---------------------------------------------------------------------------
 def _build_session() -> requests.Session:
-    """Crée une session requests avec retry automatique (backoff exponentiel)."""
+    """Crée une session requests avec retry automatique (backoff exponentiel) et en-têtes par défaut."""
     session = requests.Session()
     retries = Retry(
         total=3,
@@ -104,50 +142,95 @@ def _build_session() -> requests.Session:
     adapter = HTTPAdapter(max_retries=retries)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
     return session
 
 
-def _cache_path(url: str) -> Path:
-    """Retourne le chemin de cache pour une URL donnée (basé sur un hash)."""
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Retourne une session partagée (singleton) : pool de connexions réutilisé."""
+    global _session
+    if _session is None:
+        _session = _build_session()
+    return _session
+
+
+def _cache_paths(url: str) -> Tuple[Path, Path]:
+    """Retourne (corps HTML, métadonnées) du cache pour une URL (basé sur un hash)."""
     url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
-    today = date.today().isoformat()
-    return CACHE_DIR / f"{today}_{url_hash}.html"
+    return CACHE_DIR / f"{url_hash}.html", CACHE_DIR / f"{url_hash}.meta.json"
+
+
+def _read_cache_meta(meta_path: Path) -> Dict[str, str]:
+    """Lit les métadonnées de cache (ETag, Last-Modified, date de fetch)."""
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache_meta(meta_path: Path, meta: Dict[str, str]) -> None:
+    """Écrit les métadonnées de cache à côté du corps HTML."""
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
 
 
 def fetch_html(url: str, *, use_cache: bool = False) -> str:
     """Récupère le HTML d'une URL avec retry automatique.
 
+    Avec le cache, une copie récupérée aujourd'hui est réutilisée telle quelle ;
+    une copie plus ancienne est revalidée par GET conditionnel
+    (If-None-Match / If-Modified-Since) : un 304 évite de re-télécharger la page.
+
     Args:
         url: URL à récupérer.
         use_cache: Si True, utilise/crée un cache local (utile en dev/debug).
     """
+    today = date.today().isoformat()
+    cond_headers: Dict[str, str] = {}
+    meta: Dict[str, str] = {}
+
     # ----- Cache lecture -----
     if use_cache:
-        cached = _cache_path(url)
+        cached, meta_path = _cache_paths(url)
         if cached.exists():
-            logger.info("Cache hit : %s", cached)
-            return cached.read_text(encoding="utf-8")
+            meta = _read_cache_meta(meta_path)
+            if meta.get("fetched_on") == today:
+                logger.info("Cache hit : %s", cached)
+                return cached.read_text(encoding="utf-8")
+            if meta.get("etag"):
+                cond_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                cond_headers["If-Modified-Since"] = meta["last_modified"]
 
     # ----- Requête HTTP avec retry -----
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
-        ),
-        "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.6",
-    }
-    session = _build_session()
+    session = _get_session()
     logger.info("GET %s (retry=3, backoff=1s)", url)
-    r = session.get(url, headers=headers, timeout=30)
+    r = session.get(url, headers=cond_headers, timeout=30)
+
+    if r.status_code == 304 and cond_headers:
+        logger.info("304 Not Modified : cache revalidé %s", cached)
+        meta["fetched_on"] = today
+        _write_cache_meta(meta_path, meta)
+        return cached.read_text(encoding="utf-8")
+
     r.raise_for_status()
-    # Force UTF-8 (annuaireci est servi en UTF-8 ; évite le mojibake "茅" etc.)
-    html = r.content.decode("utf-8", errors="replace")
+    # Force UTF-8 (annuaireci est servi en UTF-8 ; évite le mojibake "茅" etc.).
+    # Fixer r.encoding évite la détection de charset ; r.text décode une seule
+    # fois avec errors="replace".
+    r.encoding = "utf-8"
+    html = r.text
 
     # ----- Cache écriture -----
     if use_cache:
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        cached = _cache_path(url)
         cached.write_text(html, encoding="utf-8")
+        _write_cache_meta(meta_path, {
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+            "fetched_on": today,
+        })
         logger.info("Cache écrit : %s", cached)
 
     return html
@@ -156,16 +239,32 @@ def fetch_html(url: str, *, use_cache: bool = False) -> str:
 # ---------------------------------------------------------------------------
 # Parsing helpers
 # ---------------------------------------------------------------------------
+def _iter_headings(soup: BeautifulSoup, names: Tuple[str, ...] = ("h2", "h3")) -> Iterator[Tag]:
+    """Itère paresseusement sur les headings (permet un arrêt au premier match)."""
+    for el in soup.descendants:
+        if isinstance(el, Tag) and el.name in names:
+            yield el
+
+
+def _week_match_to_iso(m: re.Match) -> Tuple[str, str]:
+    """Convertit un match WEEK_RE en (début, fin) ISO 8601."""
+    start = dtparse(m.group(1), dayfirst=True).date().isoformat()
+    end = dtparse(m.group(2), dayfirst=True).date().isoformat()
+    logger.debug("Période trouvée : %s → %s", start, end)
+    return start, end
+
+
 def parse_week_range(soup: BeautifulSoup) -> Tuple[str, str]:
-    """Extrait la plage de dates 'Semaine du DD/MM/YYYY au DD/MM/YYYY'."""
-    for heading in soup.find_all(["h2", "h3"]):
+    """Extrait la plage de dates 'Semaine du DD/MM/YYYY au DD/MM/YYYY'.
+
+    Seul le texte des headings (h2/h3) fait foi : la même phrase peut figurer
+    ailleurs sur la page (<title>, meta, encarts d'articles liés).
+    """
+    for heading in _iter_headings(soup):
         txt = " ".join(heading.get_text(" ", strip=True).split())
         m = WEEK_RE.search(txt)
         if m:
-            start = dtparse(m.group(1), dayfirst=True).date().isoformat()
-            end = dtparse(m.group(2), dayfirst=True).date().isoformat()
-            logger.debug("Période trouvée : %s → %s", start, end)
-            return start, end
+            return _week_match_to_iso(m)
     raise ScrapingStructureError(
         "Impossible de trouver la période (Semaine du ... au ...) sur la page."
     )
@@ -176,19 +275,28 @@ def clean_text(s: str) -> str:
     return " ".join(s.replace("\xa0", " ").split()).strip()
 
 
+def digits_only(s: str) -> str:
+    """Ne garde que les chiffres ASCII (translate en C, sans moteur regex)."""
+    return s.encode("ascii", "ignore").translate(None, NON_DIGIT_BYTES).decode("ascii")
+
+
 def extract_phones(text: str) -> List[str]:
     """Extrait et normalise les numéros de téléphone ivoiriens.
 
     Gère les formats 8 et 10 chiffres.
     Les séquences > 10 chiffres sont découpées en blocs de 10 puis de 8.
     """
-    parts = re.split(r"[\/|,;]", text)
+    # Court-circuit : moins de 8 chiffres au total → aucun numéro possible
+    if len(digits_only(text)) < 8:
+        return []
+
+    parts = PHONE_SPLIT_RE.split(text)
     phones: List[str] = []
     for p in parts:
         p = clean_text(p)
         if not p:
             continue
-        digits = re.sub(r"\D+", "", p)
+        digits = digits_only(p)
 
         if len(digits) in (8, 10):
             phones.append(digits)
@@ -197,13 +305,7 @@ def extract_phones(text: str) -> List[str]:
             _split_long_number(digits, phones)
 
     # Dédoublonnage en préservant l'ordre
-    seen: set[str] = set()
-    out: List[str] = []
-    for ph in phones:
-        if ph not in seen:
-            seen.add(ph)
-            out.append(ph)
-    return out
+    return list(dict.fromkeys(phones))
 
 
 def _split_long_number(digits: str, accumulator: List[str]) -> None:
@@ -249,10 +351,11 @@ def _collect_pharmacy_details(
     sibling = start_tag.find_next_sibling()
     while sibling:
         # Arrêt si on atteint un nouveau heading
-        if isinstance(sibling, Tag) and sibling.name in HEADING_TAGS:
+        name = getattr(sibling, "name", None)
+        if name in HEADING_TAGS:
             break
 
-        if isinstance(sibling, Tag):
+        if name is not None:
             txt = clean_text(sibling.get_text(" ", strip=True))
             if txt:
                 if PHONE_LIKE_RE.search(txt):
@@ -263,14 +366,19 @@ def _collect_pharmacy_details(
         sibling = sibling.find_next_sibling()
 
     # Fallback : si find_next_sibling n'a rien donné (structure imbriquée),
-    # on utilise find_next() restreint aux balises de contenu connues.
+    # on parcourt linéairement les éléments suivants (next_elements), restreint
+    # aux balises de contenu connues, jusqu'au prochain heading.
     if not address_lines and not phone_text:
-        logger.debug("Fallback find_next() pour '%s'", clean_text(start_tag.get_text()))
+        if logger.isEnabledFor(logging.DEBUG):
+            # get_text() matérialise tout le sous-arbre : seulement si DEBUG actif
+            logger.debug("Fallback next_elements pour '%s'", clean_text(start_tag.get_text()))
         seen_texts: set[str] = set()
-        node = start_tag.find_next(CONTENT_TAGS | HEADING_TAGS)
-        while node:
-            if node.name in HEADING_TAGS:
+        for node in start_tag.next_elements:
+            name = getattr(node, "name", None)
+            if name in HEADING_TAGS:
                 break
+            if name not in CONTENT_TAGS:
+                continue
             txt = clean_text(node.get_text(" ", strip=True))
             if txt and txt not in seen_texts:
                 seen_texts.add(txt)
@@ -278,7 +386,6 @@ def _collect_pharmacy_details(
                     phone_text += " " + txt
                 else:
                     address_lines.append(txt)
-            node = node.find_next(CONTENT_TAGS | HEADING_TAGS)
 
     return address_lines, phone_text
 
@@ -288,16 +395,18 @@ def _collect_pharmacy_details(
 # ---------------------------------------------------------------------------
 def parse_annuaireci(html: str) -> Dict:
     """Parse le HTML d'annuaireci.com et retourne les données structurées."""
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_annuaireci_from_soup(make_soup(html))
 
+
+def parse_annuaireci_from_soup(soup: BeautifulSoup) -> Dict:
+    """Extrait les données structurées depuis un DOM annuaireci déjà parsé."""
     week_start, week_end = parse_week_range(soup)
 
     # --- Point d'ancrage ---
-    anchor: Optional[Tag] = None
-    for tag in soup.find_all(["h2", "h3"]):
-        if "Liste des pharmacies de garde" in tag.get_text(strip=True):
-            anchor = tag
-            break
+    anchor: Optional[Tag] = next(
+        (t for t in _iter_headings(soup) if ANCHOR_RE.search(t.get_text(" ", strip=True))),
+        None,
+    )
     if anchor is None:
         raise ScrapingStructureError(
             "Ancre 'Liste des pharmacies de garde' introuvable."
@@ -314,30 +423,30 @@ def parse_annuaireci(html: str) -> Dict:
 
     current_area_obj: Optional[Dict] = None
 
-    # --- Parcours optimisé : on ne visite que les headings et balises de contenu ---
-    target_tags = list(HEADING_TAGS | CONTENT_TAGS)
-    node = anchor.find_next(target_tags)
+    # --- Parcours linéaire (O(N)) : on ne visite que les headings et balises de contenu ---
+    for node in anchor.next_elements:
+        tag_name = getattr(node, "name", None)
+        if tag_name not in CONTENT_OR_HEADING_TAGS:
+            continue
 
-    while node:
-        tag_name = node.name if isinstance(node, Tag) else None
+        # Texte du heading calculé une seule fois (get_text parcourt les enfants)
+        heading_text = clean_text(node.get_text()) if tag_name in HEADING_TAGS else ""
 
         # Condition d'arrêt
-        if tag_name in ("h2", "h3"):
-            heading_text = clean_text(node.get_text())
-            if heading_text in STOP_TITLES:
-                logger.debug("Stop : titre '%s' rencontré", heading_text)
-                break
+        if tag_name in ("h2", "h3") and heading_text in STOP_TITLES:
+            logger.debug("Stop : titre '%s' rencontré", heading_text)
+            break
 
         # Nouvelle zone géographique
         if tag_name == "h3":
-            area_name = clean_text(node.get_text())
+            area_name = heading_text
             current_area_obj = {"area": area_name, "pharmacies": []}
             data["areas"].append(current_area_obj)
             logger.debug("Zone : %s", area_name)
 
         # Nouvelle pharmacie
         elif tag_name == "h4" and current_area_obj is not None:
-            name = clean_text(node.get_text())
+            name = heading_text
             address_lines, phone_text = _collect_pharmacy_details(node)
 
             phones = extract_phones(phone_text)
@@ -352,8 +461,6 @@ def parse_annuaireci(html: str) -> Dict:
             )
             logger.debug("  Pharmacie : %s | %s | %s", name, address, phones)
 
-        node = node.find_next(target_tags)
-
     # --- Statistiques de résultat ---
     total_areas = len(data["areas"])
     total_pharmacies = sum(len(a["pharmacies"]) for a in data["areas"])
@@ -400,8 +507,11 @@ def main() -> None:
     # --- Récupération du HTML ---
     html = fetch_html(URL, use_cache=args.cache)
 
+    # Un seul parsing du DOM, partagé entre validation et extraction
+    soup = make_soup(html)
+
     # --- Monitoring : validation de la structure ---
-    alerts = validate_html_structure(html)
+    alerts = validate_html_structure(html, soup)
     if alerts:
         for alert in alerts:
             logger.warning(alert)
@@ -414,27 +524,26 @@ def main() -> None:
 
     # --- Parsing ---
     try:
-        payload = parse_annuaireci(html)
+        payload = parse_annuaireci_from_soup(soup)
     except ScrapingStructureError as exc:
         logger.error("Erreur de structure : %s", exc)
         sys.exit(1)
 
-    # Écriture directe en fichier UTF-8 (évite les problèmes GBK/UTF-16 de Windows)
+    # Écriture directe en octets UTF-8 (évite les problèmes GBK/UTF-16 de Windows) ;
+    # orjson sérialise en C et produit directement de l'UTF-8 non échappé.
     out_path = Path(__file__).resolve().parent / "annuaireci_week.json"
-    out_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    logger.info("JSON écrit : %s", out_path)
+    out_bytes = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
 
-    # Vérification rapide : pas de caractères mojibake résiduels
-    bad_chars = ["茅", "猫", "脟", "掳", "鈥"]
-    txt = out_path.read_text(encoding="utf-8")
-    if any(c in txt for c in bad_chars):
+    # Vérification rapide sur le JSON en mémoire (pas de relecture du fichier) :
+    # pas de caractères mojibake résiduels
+    if not MOJIBAKE_CHARS.isdisjoint(out_bytes.decode("utf-8")):
         logger.warning("⚠ Encodage encore cassé : caractères suspects trouvés dans %s", out_path)
     else:
         logger.info("✅ Encodage OK : aucun caractère suspect")
 
+    out_path.write_bytes(out_bytes)
+    logger.info("JSON écrit : %s", out_path)
+
 
 if __name__ == "__main__":
     main()
@@ -6,14 +6,18 @@ load_annuaireci_to_supabase.py et load_unppci_to_supabase.py.
 """
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
 import re
 import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from supabase import Client
+import httpx
+from supabase import Client, ClientOptions, create_client
 from unidecode import unidecode
 
 # ---------------------------------------------------------------------------
@@ -25,23 +29,49 @@ logger = logging.getLogger("db_helpers")
 # Constantes
 # ---------------------------------------------------------------------------
 SECTOR_RE = re.compile(r"^(.*?)\s+Secteur\s+(\d+)\s*$", re.IGNORECASE)
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Octets à supprimer pour ne garder que les chiffres ASCII (bytes.translate)
+NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
 
 # Retry sur les appels Supabase
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2  # secondes (×1, ×2, ×4)
 
+# Nombre de chunks envoyés en parallèle lors d'un upsert
+UPSERT_WORKERS = 4
+
+# Borne haute lignes × colonnes par requête (limite ~34k paramètres de Postgres)
+PG_MAX_PARAMS = 34000
+
+# Clés par requête de relecture : le filtre `in_()` part dans l'URL et une clé
+# SHA-1 fait ~41 caractères → ~8 Ko d'URL, sous les limites usuelles des proxys
+KEY_LOOKUP_CHUNK = 200
+
+# Client HTTP Supabase : connexions gardées ouvertes entre les chunks d'upsert
+HTTP_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 60.0  # secondes
+HTTP_TIMEOUT = 30.0  # secondes
+
 
 # ---------------------------------------------------------------------------
 # Normalisation texte
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=4096)
 def norm_text(s: str) -> str:
-    """Normalise un texte : supprime accents, minuscules, alphanum seulement."""
+    """Normalise un texte : supprime accents, minuscules, alphanum seulement.
+
+    Mémoïsé : zones et noms de pharmacies se répètent d'une ligne à l'autre.
+    Les chaînes déjà ASCII court-circuitent `unidecode` (table Python lente).
+    """
     s = (s or "").strip()
-    s = unidecode(s).lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
+    if not s.isascii():
+        s = unidecode(s)
+    s = s.lower()
+    s = NON_ALNUM_RE.sub(" ", s)
     return " ".join(s.split()).strip()
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_area(area_raw: str) -> Tuple[str, str, int | None]:
     """Extrait (city_norm, city_raw, sector) depuis une zone.
 
@@ -61,6 +91,11 @@ def parse_area(area_raw: str) -> Tuple[str, str, int | None]:
 # ---------------------------------------------------------------------------
 # Téléphones
 # ---------------------------------------------------------------------------
+def digits_only(s: str) -> str:
+    """Ne garde que les chiffres ASCII (translate en C, sans moteur regex)."""
+    return s.encode("ascii", "ignore").translate(None, NON_DIGIT_BYTES).decode("ascii")
+
+
 def phones_to_e164_ci(phones_raw: List[str]) -> List[str]:
     """Convertit les numéros ivoiriens en format E.164 (+225...).
 
@@ -70,24 +105,23 @@ def phones_to_e164_ci(phones_raw: List[str]) -> List[str]:
     """
     out: List[str] = []
     for p in phones_raw or []:
-        digits = re.sub(r"\D+", "", str(p))
+        digits = digits_only(str(p))
         if len(digits) == 10:
             out.append("+225" + digits)
         elif len(digits) == 8:
             out.append("+22501" + digits)
-            logger.debug("Numéro 8 chiffres converti : %s → +22501%s", p, digits)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Numéro 8 chiffres converti : %s → +22501%s", p, digits)
     # Dédoublonnage en préservant l'ordre
-    seen: set[str] = set()
-    res: List[str] = []
-    for x in out:
-        if x not in seen:
-            seen.add(x)
-            res.append(x)
-    return res
+    return list(dict.fromkeys(out))
 
 
 # ---------------------------------------------------------------------------
 # Clés d'idempotence (SHA-1)
+#
+# Les clés sont persistées (colonnes uniques pharmacy_key / duty_key) : changer
+# d'algorithme de hachage créerait des doublons pour toutes les lignes
+# existantes. SHA-1 est utilisé comme simple identifiant, pas pour la sécurité.
 # ---------------------------------------------------------------------------
 def compute_pharmacy_key(city_norm: str, name_norm: str) -> str:
     """Clé stable basée sur ville + nom uniquement.
@@ -96,13 +130,67 @@ def compute_pharmacy_key(city_norm: str, name_norm: str) -> str:
     si son adresse ou téléphone change légèrement entre deux semaines.
     """
     material = f"{city_norm}|{name_norm}".encode("utf-8")
-    return hashlib.sha1(material).hexdigest()
+    return hashlib.sha1(material, usedforsecurity=False).hexdigest()
 
 
 def compute_duty_key(pharmacy_key: str, start_date: str, end_date: str, source: str) -> str:
     """Clé unique pour une période de garde."""
     material = f"{pharmacy_key}|{start_date}|{end_date}|{source}".encode("utf-8")
-    return hashlib.sha1(material).hexdigest()
+    return hashlib.sha1(material, usedforsecurity=False).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Lignes à charger
+#
+# Dataclasses à __slots__ : bien plus compactes qu'un dict par ligne tant que
+# les lignes sont accumulées ; converties en dict seulement pour l'upsert.
+# ---------------------------------------------------------------------------
+@dataclass(slots=True)
+class PharmacyRow:
+    """Ligne de la table `pharmacies`."""
+
+    pharmacy_key: str
+    name_raw: str
+    name_norm: str
+    address_raw: str
+    address_norm: str
+    area_raw: str
+    city_norm: str
+    sector: int | None
+    phones_raw: List[str]
+    phones_e164: List[str]
+    source_last: str
+    source_url_last: str
+    updated_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict pour l'upsert (sans la copie profonde de `dataclasses.asdict`)."""
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+@dataclass(slots=True)
+class DutyPeriodRow:
+    """Période de garde avant résolution de `pharmacy_id` (via `pharmacy_key`)."""
+
+    duty_key: str
+    pharmacy_key: str
+    start_date: str
+    end_date: str
+    source: str
+    source_url: str
+    scraped_at: str
+
+    def to_dict(self, pharmacy_id: str) -> Dict[str, Any]:
+        """Dict pour l'upsert `duty_periods`, avec l'id de pharmacie résolu."""
+        return {
+            "duty_key": self.duty_key,
+            "pharmacy_id": pharmacy_id,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "source": self.source,
+            "source_url": self.source_url,
+            "scraped_at": self.scraped_at,
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -122,52 +210,113 @@ def chunks(lst: list, n: int = 200):
 # ---------------------------------------------------------------------------
 # Supabase helpers avec retry
 # ---------------------------------------------------------------------------
+def create_supabase_client(url: str, key: str) -> Client:
+    """Crée le client Supabase avec un client httpx réglé pour les upserts.
+
+    HTTP/2 et keep-alive long : les chunks envoyés en rafale (et en parallèle)
+    réutilisent les mêmes connexions au lieu de refaire TCP + TLS.
+    """
+    http_client = httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT),
+    )
+    return create_client(url, key, options=ClientOptions(httpx_client=http_client))
+
+
+def _upsert_chunk(
+    sb: Client,
+    table: str,
+    ch: List[Dict[str, Any]],
+    index: int,
+    conflict_col: str,
+    returning: str,
+) -> List[Dict[str, Any]]:
+    """Upsert d'un seul chunk avec retry ; retourne les lignes renvoyées."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            resp = (
+                sb.table(table)
+                .upsert(ch, on_conflict=conflict_col, returning=returning)
+                .execute()
+            )
+            logger.debug(
+                "  [%s] chunk %d : %d lignes upsertées (tentative %d)",
+                table, index + 1, len(ch), attempt,
+            )
+            return resp.data or []
+        except Exception as exc:
+            wait = RETRY_BACKOFF * (2 ** (attempt - 1))
+            if attempt < MAX_RETRIES:
+                logger.warning(
+                    "  [%s] chunk %d erreur (tentative %d/%d) : %s — retry dans %ds",
+                    table, index + 1, attempt, MAX_RETRIES, exc, wait,
+                )
+                time.sleep(wait)
+            else:
+                logger.error(
+                    "  [%s] chunk %d ÉCHEC après %d tentatives : %s",
+                    table, index + 1, MAX_RETRIES, exc,
+                )
+                raise
+    return []
+
+
 def upsert_with_retry(
     sb: Client,
     table: str,
     rows: List[Dict[str, Any]],
     conflict_col: str,
     chunk_size: int = 200,
+    id_map: Optional[Dict[str, str]] = None,
+    max_workers: int = UPSERT_WORKERS,
 ) -> int:
     """Upsert par chunks avec retry automatique sur erreur réseau.
 
+    Les chunks sont envoyés en parallèle (pool de `max_workers` threads) :
+    l'attente réseau de chaque requête se recouvre avec les autres.
+
+    Si `id_map` est fourni, l'upsert demande `returning="representation"` et
+    le dict est complété avec {valeur de conflict_col → id} depuis la réponse,
+    ce qui évite un SELECT de relecture. Sinon `returning="minimal"`.
+
+    `chunk_size` est plafonné à PG_MAX_PARAMS // nombre de colonnes.
+
     Retourne le nombre total de lignes upsertées.
     """
+    if rows:
+        chunk_size = max(1, min(chunk_size, PG_MAX_PARAMS // max(1, len(rows[0]))))
+    returning = "representation" if id_map is not None else "minimal"
     total = 0
-    for i, ch in enumerate(chunks(rows, chunk_size)):
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                sb.table(table).upsert(ch, on_conflict=conflict_col).execute()
-                total += len(ch)
-                logger.debug(
-                    "  [%s] chunk %d : %d lignes upsertées (tentative %d)",
-                    table, i + 1, len(ch), attempt,
-                )
-                break
-            except Exception as exc:
-                wait = RETRY_BACKOFF * (2 ** (attempt - 1))
-                if attempt < MAX_RETRIES:
-                    logger.warning(
-                        "  [%s] chunk %d erreur (tentative %d/%d) : %s — retry dans %ds",
-                        table, i + 1, attempt, MAX_RETRIES, exc, wait,
-                    )
-                    time.sleep(wait)
-                else:
-                    logger.error(
-                        "  [%s] chunk %d ÉCHEC après %d tentatives : %s",
-                        table, i + 1, MAX_RETRIES, exc,
-                    )
-                    raise
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_upsert_chunk, sb, table, ch, i, conflict_col, returning): len(ch)
+            for i, ch in enumerate(chunks(rows, chunk_size))
+        }
+        for fut in as_completed(futures):
+            data = fut.result()
+            if id_map is not None:
+                for row in data:
+                    id_map[row[conflict_col]] = row["id"]
+            total += futures[fut]
     return total
 
 
 def fetch_key_to_id(
     sb: Client,
     all_keys: List[str],
+    chunk_size: int = KEY_LOOKUP_CHUNK,
 ) -> Dict[str, str]:
-    """Récupère le mapping pharmacy_key → id depuis Supabase, par chunks."""
+    """Récupère le mapping pharmacy_key → id depuis Supabase, par chunks.
+
+    Sert de repli pour les clés absentes de la réponse de l'upsert.
+    """
     key_to_id: Dict[str, str] = {}
-    for ch in chunks(all_keys, 200):
+    for ch in chunks(all_keys, chunk_size):
         resp = sb.table("pharmacies").select("id, pharmacy_key").in_("pharmacy_key", ch).execute()
         for row in resp.data:
             key_to_id[row["pharmacy_key"]] = row["id"]
@@ -1,16 +1,14 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
 import time
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
+import orjson
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 from db_helpers import (
     norm_text,
@@ -19,8 +17,8 @@ from db_helpers import (
     compute_pharmacy_key,
     compute_duty_key,
     now_utc_iso,
-    chunks,
     upsert_with_retry,
+    create_supabase_client,
     fetch_key_to_id,
 )
 
@@ -56,7 +54,7 @@ def main() -> None:
         logger.error("Variables SUPABASE_URL ou SUPABASE_SERVICE_ROLE_KEY manquantes dans .env")
         sys.exit(1)
 
-    sb = create_client(url, key)
+    sb = create_supabase_client(url, key)
     logger.info("Connexion Supabase OK")
 
     # --- Lecture du JSON (chemin relatif au script) ---
@@ -64,7 +62,7 @@ def main() -> None:
     if not input_path.exists():
         logger.error("Fichier introuvable : %s", input_path)
         sys.exit(1)
-    payload = json.loads(input_path.read_text(encoding="utf-8"))
+    payload = orjson.loads(input_path.read_bytes())
     logger.info("Fichier chargé : %s", input_path)
 
     source = payload["source"]
@@ -75,9 +73,10 @@ def main() -> None:
 
     logger.info("Période : %s → %s (source: %s)", week_start, week_end, source)
 
-    # --- Phase 1 : Préparer les lignes ---
-    pharmacy_rows: List[Dict[str, Any]] = []
-    duty_rows_pre: List[Dict[str, Any]] = []
+    # --- Phase 1 : Préparer les lignes (dédupliquées dès la construction) ---
+    # pharmacy_key → ligne (garder le dernier) ; duty_key → ligne
+    pharmacy_by_key: Dict[str, Dict[str, Any]] = {}
+    duty_pre_by_key: Dict[str, Dict[str, Any]] = {}
 
     for area in payload.get("areas", []):
         area_raw = area.get("area", "")
@@ -95,7 +94,7 @@ def main() -> None:
             # Clé stable : ville + nom seulement
             pharmacy_key = compute_pharmacy_key(city_norm, name_norm)
 
-            pharmacy_rows.append({
+            pharmacy_by_key[pharmacy_key] = {
                 "pharmacy_key": pharmacy_key,
                 "name_raw": name_raw,
                 "name_norm": name_norm,
@@ -109,43 +108,46 @@ def main() -> None:
                 "source_last": source,
                 "source_url_last": source_url,
                 "updated_at": scraped_at,
-            })
+            }
 
-            duty_rows_pre.append({
-                "duty_key": compute_duty_key(pharmacy_key, week_start, week_end, source),
+            duty_key = compute_duty_key(pharmacy_key, week_start, week_end, source)
+            duty_pre_by_key[duty_key] = {
+                "duty_key": duty_key,
                 "pharmacy_key": pharmacy_key,
                 "start_date": week_start,
                 "end_date": week_end,
                 "source": source,
                 "source_url": source_url,
                 "scraped_at": scraped_at,
-            })
+            }
 
-    # Dédup pharmacies par pharmacy_key (garder le dernier)
-    dedup: Dict[str, Dict[str, Any]] = {}
-    for r in pharmacy_rows:
-        dedup[r["pharmacy_key"]] = r
-    pharmacy_rows = list(dedup.values())
+    pharmacy_rows = list(pharmacy_by_key.values())
+    duty_rows_pre = list(duty_pre_by_key.values())
 
     logger.info(
         "Préparé : %d pharmacies uniques, %d périodes de garde",
         len(pharmacy_rows), len(duty_rows_pre),
     )
 
-    # --- Phase 2 : Upsert pharmacies ---
+    # --- Phase 2 : Upsert pharmacies (les ids reviennent dans la réponse) ---
     logger.info("Upsert pharmacies...")
-    n_ph = upsert_with_retry(sb, "pharmacies", pharmacy_rows, "pharmacy_key", chunk_size=200)
+    key_to_id: Dict[str, str] = {}
+    n_ph = upsert_with_retry(
+        sb, "pharmacies", pharmacy_rows, "pharmacy_key", chunk_size=500, id_map=key_to_id,
+    )
     logger.info("Pharmacies upsertées : %d", n_ph)
 
-    # --- Phase 3 : Récupérer le mapping pharmacy_key → id ---
-    all_keys = [r["pharmacy_key"] for r in pharmacy_rows]
-    key_to_id = fetch_key_to_id(sb, all_keys)
+    # --- Phase 3 : Compléter le mapping pharmacy_key → id (repli SELECT) ---
+    unresolved = pharmacy_by_key.keys() - key_to_id.keys()
+    if unresolved:
+        logger.debug("%d clés absentes de la réponse upsert, relecture", len(unresolved))
+        key_to_id.update(fetch_key_to_id(sb, list(unresolved)))
 
-    missing = [k for k in all_keys if k not in key_to_id]
+    missing = pharmacy_by_key.keys() - key_to_id.keys()
     if missing:
         logger.error(
             "ERREUR : %d pharmacy_key sans id après upsert. Exemples : %s",
-            len(missing), missing[:3],
+            len(missing), sorted(missing)[:3],
         )
         sys.exit(1)
 
@@ -168,14 +170,8 @@ def main() -> None:
             "scraped_at": d["scraped_at"],
         })
 
-    # Dédup duty rows par duty_key
-    duty_dedup: Dict[str, Dict[str, Any]] = {}
-    for r in duty_rows:
-        duty_dedup[r["duty_key"]] = r
-    duty_rows = list(duty_dedup.values())
-
     logger.info("Upsert duty_periods...")
-    n_duty = upsert_with_retry(sb, "duty_periods", duty_rows, "duty_key", chunk_size=500)
+    n_duty = upsert_with_retry(sb, "duty_periods", duty_rows, "duty_key", chunk_size=1000)
     logger.info("Duty periods upsertées : %d", n_duty)
 
     # --- Résumé ---
@@ -10,15 +10,19 @@ Pipeline complet :
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+import orjson
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 
 from db_helpers import (
     norm_text,
@@ -28,16 +32,22 @@ from db_helpers import (
     compute_duty_key,
     now_utc_iso,
     upsert_with_retry,
+    create_supabase_client,
     fetch_key_to_id,
+    PharmacyRow,
+    DutyPeriodRow,
 )
 from unppci_discover import (
     discover_articles,
     discover_pdfs_from_article,
     download_pdf as discover_download_pdf,
     filter_pdfs_current_month,
+    Article,
     PdfDoc,
+    ARTICLE_WORKERS,
+    DOWNLOAD_WORKERS,
 )
-from unppci_parse_pdf import parse_unppci_pdf
+from unppci_parse_pdf import parse_unppci_pdf, worker_pool_kwargs
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -49,6 +59,18 @@ logger = logging.getLogger("load_unppci")
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = Path(__file__).resolve().parent
 
+# Taille par défaut des chunks d'upsert (plafonnée par db_helpers.PG_MAX_PARAMS)
+DEFAULT_BATCH_SIZE = 5000
+
+# Requêtes de vérification d'ingestion simultanées (une par PDF)
+INGEST_CHECK_WORKERS = 8
+
+# Nombre de PDF parsés simultanément (processus séparés)
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Sortie de --dry-run (lignes construites, rien n'est envoyé à Supabase)
+DRY_RUN_OUTPUT = SCRIPT_DIR / "unppci_dry_run.json"
+
 
 # ---------------------------------------------------------------------------
 # Découverte & téléchargement
@@ -58,28 +80,54 @@ def discover_and_download(
     use_cache: bool = True,
     current_month_only: bool = True,
     max_articles: int = 5,
-) -> List[Dict[str, Any]]:
+) -> Tuple[List[Dict[str, Any]], int]:
     """Découvre les articles, extrait les PDF, télécharge et parse.
 
-    Retourne une liste de dicts : {"pdf": PdfDoc, "path": Path, "payload": dict}.
+    Toute l'étape tourne dans une seule boucle asyncio : les articles sont
+    scannés en parallèle, puis les PDF téléchargés/parsés en parallèle.
+
+    Retourne (résultats, nombre de PDF en échec de parsing), les résultats
+    étant des dicts : {"pdf": PdfDoc, "path": Path, "payload": dict}.
     """
+    return asyncio.run(
+        _discover_and_download_async(
+            use_cache=use_cache,
+            current_month_only=current_month_only,
+            max_articles=max_articles,
+        )
+    )
+
+
+async def _discover_and_download_async(
+    *,
+    use_cache: bool,
+    current_month_only: bool,
+    max_articles: int,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Implémentation asynchrone de discover_and_download."""
     logger.info("Découverte des articles UNPPCI...")
-    articles = discover_articles(use_cache=use_cache, max_pages=3, garde_only=True)
+    articles = await asyncio.to_thread(
+        discover_articles, use_cache=use_cache, max_pages=3, garde_only=True,
+    )
 
     if not articles:
         logger.warning("Aucun article trouvé sur UNPPCI.")
-        return []
+        return [], 0
 
     # Garder les N articles les plus récents (ID le plus élevé = plus récent)
     articles_sorted = sorted(articles, key=lambda a: a.id, reverse=True)[:max_articles]
     logger.info("%d articles de garde trouvés (top %d retenus)", len(articles), len(articles_sorted))
 
-    # Extraire tous les PDF
-    all_pdfs: List[PdfDoc] = []
-    for art in articles_sorted:
-        pdfs = discover_pdfs_from_article(art, use_cache=use_cache)
-        garde_pdfs = [p for p in pdfs if p.is_garde]
-        all_pdfs.extend(garde_pdfs)
+    # Extraire tous les PDF (une requête par article, au plus ARTICLE_WORKERS
+    # en parallèle : mêmes limites envers unppci.org que unppci_discover.py)
+    article_sem = asyncio.Semaphore(ARTICLE_WORKERS)
+
+    async def scan_article(art: Article) -> List[PdfDoc]:
+        async with article_sem:
+            return await asyncio.to_thread(discover_pdfs_from_article, art, use_cache=use_cache)
+
+    pdfs_per_article = await asyncio.gather(*(scan_article(art) for art in articles_sorted))
+    all_pdfs: List[PdfDoc] = [p for pdfs in pdfs_per_article for p in pdfs if p.is_garde]
 
     logger.info("Total PDF de garde découverts : %d", len(all_pdfs))
 
@@ -91,41 +139,98 @@ def discover_and_download(
 
     if not all_pdfs:
         logger.warning("Aucun PDF pertinent trouvé après filtrage.")
-        return []
+        return [], 0
+
+    # Télécharger et parser les PDF en parallèle
+    return await _download_and_parse_all(all_pdfs, use_cache=use_cache)
+
 
-    # Télécharger et parser chaque PDF
-    results: List[Dict[str, Any]] = []
-    for pdf in all_pdfs:
-        logger.info("Téléchargement : %s — %s", pdf.label, pdf.url)
-        pdf_path = discover_download_pdf(pdf, use_cache=use_cache)
+async def _download_and_parse_all(
+    pdfs: List[PdfDoc],
+    *,
+    use_cache: bool,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Pipeline producteur/consommateur : téléchargements et parsing se recouvrent.
+
+    - Producteurs : un par PDF, au plus DOWNLOAD_WORKERS téléchargements
+      simultanés ; chaque PDF téléchargé est déposé dans une asyncio.Queue.
+    - Consommateurs : PARSE_WORKERS tâches qui parsent les PDF dès leur
+      arrivée, pendant que les autres téléchargements continuent. Le parsing
+      (CPU, GIL) s'exécute dans un ProcessPoolExecutor pour utiliser tous
+      les cœurs.
+
+    L'ordre des résultats suit celui de `pdfs`. Les échecs de téléchargement
+    sont écartés ; les échecs de parsing aussi, mais comptés et retournés
+    (retour : (résultats, nombre d'échecs de parsing)).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    sem = asyncio.Semaphore(DOWNLOAD_WORKERS)
+    parsed: Dict[int, Dict[str, Any]] = {}
+    parse_failures = 0
+    loop = asyncio.get_running_loop()
+
+    async def produce(idx: int, pdf: PdfDoc) -> None:
+        async with sem:
+            logger.info("Téléchargement : %s — %s", pdf.label, pdf.url)
+            pdf_path = await asyncio.to_thread(discover_download_pdf, pdf, use_cache=use_cache)
         if pdf_path is None:
             logger.error("  Échec du téléchargement : %s", pdf.url)
-            continue
+            return
+        await queue.put((idx, pdf, pdf_path))
 
-        logger.info("  Parsing : %s", pdf_path.name)
-        payload = parse_unppci_pdf(str(pdf_path), source_url=pdf.url)
-        results.append({"pdf": pdf, "path": pdf_path, "payload": payload})
-
-    return results
+    async def consume() -> None:
+        nonlocal parse_failures
+        while True:
+            idx, pdf, pdf_path = await queue.get()
+            try:
+                logger.info("  Parsing : %s", pdf_path.name)
+                payload = await loop.run_in_executor(
+                    pool, partial(parse_unppci_pdf, str(pdf_path), source_url=pdf.url),
+                )
+                parsed[idx] = {"pdf": pdf, "path": pdf_path, "payload": payload}
+            except Exception as exc:
+                parse_failures += 1
+                logger.error("  Échec du parsing %s : %s", pdf_path.name, exc)
+            finally:
+                queue.task_done()
+
+    # MP_CONTEXT (forkserver) : les threads de téléchargement tournent déjà
+    # quand le premier PDF est soumis, un fork à ce moment risquerait un
+    # interblocage sur un verrou hérité. L'initializer rétablit la config
+    # logging du parent dans chaque worker (logs de parsing par PDF).
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS, **worker_pool_kwargs()) as pool:
+        consumers = [asyncio.create_task(consume()) for _ in range(PARSE_WORKERS)]
+        try:
+            await asyncio.gather(*(produce(i, pdf) for i, pdf in enumerate(pdfs)))
+            await queue.join()
+        finally:
+            # Aussi quand un producteur lève : pas de consommateur laissé en attente
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+
+    return [parsed[i] for i in sorted(parsed)], parse_failures
 
 
 # ---------------------------------------------------------------------------
 # Chargement Supabase
 # ---------------------------------------------------------------------------
-def load_payload_to_supabase(
-    sb: Client,
+def build_rows(
     payload: Dict[str, Any],
     pdf_url: str,
     scraped_at: str,
-) -> Dict[str, int]:
-    """Charge un payload (issu de parse_unppci_pdf) dans Supabase.
+) -> Tuple[Dict[str, PharmacyRow], Dict[str, DutyPeriodRow]]:
+    """Construit les lignes (pharmacies, duty_periods pré-mapping) d'un payload.
 
-    Retourne {"pharmacies": n, "duties": n}.
+    Les lignes sont dédupliquées dès la construction : dicts indexés par
+    `pharmacy_key` et `duty_key` (la dernière occurrence l'emporte).
+    Les duty_periods portent encore `pharmacy_key` : l'id est résolu après
+    l'upsert des pharmacies.
     """
     source = payload.get("source", "unppci")
 
-    pharmacy_rows: List[Dict[str, Any]] = []
-    duty_rows_pre: List[Dict[str, Any]] = []
+    pharmacy_rows: Dict[str, PharmacyRow] = {}
+    duty_rows_pre: Dict[str, DutyPeriodRow] = {}
 
     for wk in payload.get("weeks", []):
         week_start = wk["week_start"]
@@ -133,12 +238,13 @@ def load_payload_to_supabase(
 
         for area in wk.get("areas", []):
             area_raw = area.get("area", "")
-            city_norm, city_raw, sector = parse_area(area_raw)
+            city_norm, _city_raw, sector = parse_area(area_raw)
 
             for ph in area.get("pharmacies", []):
                 name_raw = (ph.get("name_raw") or "").strip()
                 address_raw = (ph.get("address_raw") or "").strip()
-                phones_raw = ph.get("phones_raw") or []
+                # Numéros vides retirés et doublons fusionnés (corps d'upsert plus léger)
+                phones_raw = list(dict.fromkeys(p for p in ph.get("phones_raw") or [] if p))
 
                 name_norm = norm_text(name_raw)
                 address_norm = norm_text(address_raw)
@@ -147,37 +253,54 @@ def load_payload_to_supabase(
                 # Clé stable : ville + nom seulement
                 pharmacy_key = compute_pharmacy_key(city_norm, name_norm)
 
-                pharmacy_rows.append({
-                    "pharmacy_key": pharmacy_key,
-                    "name_raw": name_raw,
-                    "name_norm": name_norm,
-                    "address_raw": address_raw,
-                    "address_norm": address_norm,
-                    "area_raw": area_raw,
-                    "city_norm": city_norm,
-                    "sector": sector,
-                    "phones_raw": phones_raw,
-                    "phones_e164": phones_e164,
-                    "source_last": source,
-                    "source_url_last": pdf_url,
-                    "updated_at": scraped_at,
-                })
-
-                duty_rows_pre.append({
-                    "duty_key": compute_duty_key(pharmacy_key, week_start, week_end, source),
-                    "pharmacy_key": pharmacy_key,
-                    "start_date": week_start,
-                    "end_date": week_end,
-                    "source": source,
-                    "source_url": pdf_url,
-                    "scraped_at": scraped_at,
-                })
-
-    # --- Dédup pharmacies par pharmacy_key ---
-    dedup: Dict[str, Dict[str, Any]] = {}
-    for r in pharmacy_rows:
-        dedup[r["pharmacy_key"]] = r
-    pharmacy_rows = list(dedup.values())
+                pharmacy_rows[pharmacy_key] = PharmacyRow(
+                    pharmacy_key=pharmacy_key,
+                    name_raw=name_raw,
+                    name_norm=name_norm,
+                    address_raw=address_raw,
+                    address_norm=address_norm,
+                    area_raw=area_raw,
+                    city_norm=city_norm,
+                    sector=sector,
+                    phones_raw=phones_raw,
+                    phones_e164=phones_e164,
+                    source_last=source,
+                    source_url_last=pdf_url,
+                    updated_at=scraped_at,
+                )
+
+                duty_key = compute_duty_key(pharmacy_key, week_start, week_end, source)
+                duty_rows_pre[duty_key] = DutyPeriodRow(
+                    duty_key=duty_key,
+                    pharmacy_key=pharmacy_key,
+                    start_date=week_start,
+                    end_date=week_end,
+                    source=source,
+                    source_url=pdf_url,
+                    scraped_at=scraped_at,
+                )
+
+    return pharmacy_rows, duty_rows_pre
+
+
+def load_rows_to_supabase(
+    sb: Client,
+    pharmacy_by_key: Dict[str, PharmacyRow],
+    duty_pre_by_key: Dict[str, DutyPeriodRow],
+    *,
+    pharmacy_batch: int = DEFAULT_BATCH_SIZE,
+    duty_batch: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, int]:
+    """Charge des lignes déjà dédupliquées (d'un ou plusieurs PDF) dans Supabase.
+
+    Exactement un upsert pharmacies, une résolution des ids et un upsert
+    duty_periods, quel que soit le nombre de PDF agrégés.
+    `pharmacy_batch` / `duty_batch` : taille des chunks d'upsert par table.
+
+    Retourne {"pharmacies": n, "duties": n}.
+    """
+    pharmacy_rows = [r.to_dict() for r in pharmacy_by_key.values()]
+    duty_rows_pre = list(duty_pre_by_key.values())
 
     logger.info(
         "  Préparé : %d pharmacies uniques, %d périodes de garde",
@@ -185,23 +308,29 @@ def load_payload_to_supabase(
     )
 
     if not pharmacy_rows:
-        logger.warning("  Aucune pharmacie à charger pour ce PDF.")
+        logger.warning("  Aucune pharmacie à charger.")
         return {"pharmacies": 0, "duties": 0}
 
-    # --- Upsert pharmacies ---
+    # --- Upsert pharmacies (les ids reviennent dans la réponse) ---
     logger.info("  Upsert pharmacies...")
-    n_ph = upsert_with_retry(sb, "pharmacies", pharmacy_rows, "pharmacy_key", chunk_size=200)
+    key_to_id: Dict[str, str] = {}
+    n_ph = upsert_with_retry(
+        sb, "pharmacies", pharmacy_rows, "pharmacy_key",
+        chunk_size=pharmacy_batch, id_map=key_to_id,
+    )
     logger.info("  Pharmacies upsertées : %d", n_ph)
 
-    # --- Mapping pharmacy_key → id ---
-    all_keys = [r["pharmacy_key"] for r in pharmacy_rows]
-    key_to_id = fetch_key_to_id(sb, all_keys)
+    # --- Mapping pharmacy_key → id (repli SELECT pour les clés non renvoyées) ---
+    unresolved = pharmacy_by_key.keys() - key_to_id.keys()
+    if unresolved:
+        logger.debug("  %d clés absentes de la réponse upsert, relecture", len(unresolved))
+        key_to_id.update(fetch_key_to_id(sb, list(unresolved)))
 
-    missing = [k for k in all_keys if k not in key_to_id]
+    missing = pharmacy_by_key.keys() - key_to_id.keys()
     if missing:
         logger.error(
             "  %d pharmacy_key sans id après upsert. Exemples : %s",
-            len(missing), missing[:3],
+            len(missing), sorted(missing)[:3],
         )
 
     logger.info("  Mapping pharmacy_key → id : %d entrées", len(key_to_id))
@@ -209,44 +338,88 @@ def load_payload_to_supabase(
     # --- Construire et upsert les duty_periods ---
     duty_rows: List[Dict[str, Any]] = []
     for d in duty_rows_pre:
-        pid = key_to_id.get(d["pharmacy_key"])
+        pid = key_to_id.get(d.pharmacy_key)
         if pid is None:
-            logger.warning("  pharmacy_key introuvable, duty ignorée : %s", d["pharmacy_key"])
+            logger.warning("  pharmacy_key introuvable, duty ignorée : %s", d.pharmacy_key)
             continue
-        duty_rows.append({
-            "duty_key": d["duty_key"],
-            "pharmacy_id": pid,
-            "start_date": d["start_date"],
-            "end_date": d["end_date"],
-            "source": d["source"],
-            "source_url": d["source_url"],
-            "scraped_at": d["scraped_at"],
-        })
-
-    # Dédup duty rows par duty_key
-    duty_dedup: Dict[str, Dict[str, Any]] = {}
-    for r in duty_rows:
-        duty_dedup[r["duty_key"]] = r
-    duty_rows = list(duty_dedup.values())
+        duty_rows.append(d.to_dict(pid))
+
+    if not duty_rows:
+        logger.info("  Aucune duty à charger.")
+        return {"pharmacies": n_ph, "duties": 0}
 
     logger.info("  Upsert duty_periods...")
-    n_duty = upsert_with_retry(sb, "duty_periods", duty_rows, "duty_key", chunk_size=500)
+    n_duty = upsert_with_retry(
+        sb, "duty_periods", duty_rows, "duty_key", chunk_size=duty_batch,
+    )
     logger.info("  Duty periods upsertées : %d", n_duty)
 
     return {"pharmacies": n_ph, "duties": n_duty}
 
 
+def write_dry_run(
+    pharmacy_by_key: Dict[str, PharmacyRow],
+    duty_pre_by_key: Dict[str, DutyPeriodRow],
+    path: Path = DRY_RUN_OUTPUT,
+) -> Dict[str, int]:
+    """Écrit les lignes dédupliquées dans un JSON local au lieu de les charger.
+
+    Aucun appel Supabase : sert à vérifier le parsing hors ligne et à mesurer
+    son coût séparément de celui de la base.
+
+    Retourne {"pharmacies": n, "duties": n}.
+    """
+    out = {
+        "pharmacies": list(pharmacy_by_key.values()),
+        "duty_periods": list(duty_pre_by_key.values()),
+    }
+    path.write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    logger.info("Dry-run : lignes écrites dans %s", path)
+    return {"pharmacies": len(pharmacy_by_key), "duties": len(duty_pre_by_key)}
+
+
+def _is_ingested(sb: Client, url: str) -> bool:
+    """Vrai si duty_periods contient déjà au moins une ligne pour ce PDF.
+
+    En cas d'erreur, retourne False (le PDF sera chargé).
+    """
+    try:
+        resp = (
+            sb.table("duty_periods")
+            .select("id")
+            .eq("source", "unppci")
+            .eq("source_url", url)
+            .limit(1)
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning(
+            "Erreur lors de la vérification d'ingestion pour %s : %s — on continue",
+            url, exc,
+        )
+        return False
+    return bool(resp.data)
+
+
+def fetch_ingested_urls(sb: Client, urls: List[str]) -> set[str]:
+    """Retourne le sous-ensemble de `urls` déjà présent dans duty_periods.
+
+    Une requête d'existence `limit(1)` par PDF (une ligne au plus par
+    réponse, jamais tronquée par le max-rows de PostgREST), lancées en
+    parallèle sur INGEST_CHECK_WORKERS threads.
+    """
+    if not urls:
+        return set()
+    with ThreadPoolExecutor(max_workers=min(INGEST_CHECK_WORKERS, len(urls))) as pool:
+        flags = list(pool.map(partial(_is_ingested, sb), urls))
+    return {url for url, ingested in zip(urls, flags) if ingested}
+
+
 # ---------------------------------------------------------------------------
 # Point d'entrée CLI
 # ---------------------------------------------------------------------------
 def main() -> None:
     """Point d'entrée principal."""
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        stream=sys.stderr,
-    )
     t_start = time.monotonic()
 
     parser = argparse.ArgumentParser(
@@ -268,30 +441,58 @@ def main() -> None:
         "--force", action="store_true",
         help="Forcer le rechargement même si le PDF semble déjà ingéré",
     )
+    parser.add_argument(
+        "--pharmacy-batch", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Lignes par chunk d'upsert pour pharmacies (défaut: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--duty-batch", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Lignes par chunk d'upsert pour duty_periods (défaut: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help=f"Construire les lignes sans toucher Supabase (écrites dans {DRY_RUN_OUTPUT.name})",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="Afficher les logs de debug (défaut: INFO)",
+    )
     args = parser.parse_args()
 
-    # --- Env ---
-    load_dotenv(SCRIPT_DIR.parent / ".env")
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    if not url or not key:
-        logger.error("Variables SUPABASE_URL ou SUPABASE_SERVICE_ROLE_KEY manquantes dans .env")
-        sys.exit(1)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        stream=sys.stderr,
+    )
 
-    sb = create_client(url, key)
-    logger.info("Connexion Supabase OK")
+    # --- Env (inutile en dry-run) ---
+    sb: Client | None = None
+    if not args.dry_run:
+        load_dotenv(SCRIPT_DIR.parent / ".env")
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        if not url or not key:
+            logger.error("Variables SUPABASE_URL ou SUPABASE_SERVICE_ROLE_KEY manquantes dans .env")
+            sys.exit(1)
+
+        sb = create_supabase_client(url, key)
+        logger.info("Connexion Supabase OK")
 
     # --- Découverte, téléchargement et parsing ---
     use_cache = not args.no_cache
     current_month_only = not args.all_months
 
-    results = discover_and_download(
+    results, parse_failures = discover_and_download(
         use_cache=use_cache,
         current_month_only=current_month_only,
         max_articles=args.max_articles,
     )
 
     if not results:
+        if parse_failures:
+            logger.error("Aucun PDF à charger : %d PDF en échec de parsing.", parse_failures)
+            sys.exit(1)
         logger.warning("Aucun PDF à charger. Fin.")
         sys.exit(0)
 
@@ -299,48 +500,60 @@ def main() -> None:
 
     # --- Chargement dans Supabase ---
     scraped_at = now_utc_iso()
-    total_ph = 0
-    total_duty = 0
+
+    # Vérification d'ingestion préalable (sauf si --force), PDF vérifiés en parallèle
+    ingested: set[str] = set()
+    if sb is not None and not args.force:
+        ingested = fetch_ingested_urls(sb, [item["pdf"].url for item in results])
+
+    # Agréger les lignes de tous les PDF pour un seul chargement par table
+    # (dicts indexés par clé : la dédup inter-PDF se fait à l'insertion)
+    all_pharmacy_rows: Dict[str, PharmacyRow] = {}
+    all_duty_rows_pre: Dict[str, DutyPeriodRow] = {}
+    n_pdfs = 0
 
     for item in results:
         pdf: PdfDoc = item["pdf"]
         payload: Dict[str, Any] = item["payload"]
         pdf_url = pdf.url
 
-        # Vérification d'ingestion préalable (sauf si --force)
-        if not args.force:
-            try:
-                resp = (
-                    sb.table("duty_periods")
-                    .select("id")
-                    .eq("source", "unppci")
-                    .eq("source_url", pdf_url)
-                    .limit(1)
-                    .execute()
-                )
-                if resp.data:
-                    logger.info("SKIP (déjà ingéré) : %s", pdf_url)
-                    continue
-            except Exception as exc:
-                logger.warning(
-                    "Erreur lors de la vérification d'ingestion pour %s : %s — on continue",
-                    pdf_url, exc,
-                )
+        if pdf_url in ingested:
+            logger.info("SKIP (déjà ingéré) : %s", pdf_url)
+            continue
 
-        logger.info("Chargement du PDF : %s — %s", pdf.label, pdf_url)
-        counts = load_payload_to_supabase(sb, payload, pdf_url, scraped_at)
-        total_ph += counts["pharmacies"]
-        total_duty += counts["duties"]
+        logger.info("Préparation du PDF : %s — %s", pdf.label, pdf_url)
+        pharmacy_rows, duty_rows_pre = build_rows(payload, pdf_url, scraped_at)
+        all_pharmacy_rows.update(pharmacy_rows)
+        all_duty_rows_pre.update(duty_rows_pre)
+        n_pdfs += 1
         logger.info(
             "  → %d pharmacies, %d duty_periods",
-            counts["pharmacies"], counts["duties"],
+            len(pharmacy_rows), len(duty_rows_pre),
+        )
+
+    if sb is None:
+        counts = write_dry_run(all_pharmacy_rows, all_duty_rows_pre)
+    else:
+        logger.info("Chargement de %d PDF en un seul lot", n_pdfs)
+        counts = load_rows_to_supabase(
+            sb, all_pharmacy_rows, all_duty_rows_pre,
+            pharmacy_batch=args.pharmacy_batch,
+            duty_batch=args.duty_batch,
         )
 
     # --- Résumé ---
     elapsed = time.monotonic() - t_start
+    if parse_failures:
+        # Les PDF parsés sont chargés, mais le run est signalé en échec
+        logger.error(
+            "❌ Terminé en %.1fs avec %d PDF en échec de parsing — "
+            "%d pharmacies, %d duty_periods chargées",
+            elapsed, parse_failures, counts["pharmacies"], counts["duties"],
+        )
+        sys.exit(1)
     logger.info(
         "✅ Terminé en %.1fs — %d pharmacies, %d duty_periods (total)",
-        elapsed, total_ph, total_duty,
+        elapsed, counts["pharmacies"], counts["duties"],
     )
 
 
@@ -0,0 +1,43 @@
+"""Configuration pytest : les scripts ETL s'importent comme modules de premier niveau."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ETL_DIR = Path(__file__).resolve().parents[1]
+if str(ETL_DIR) not in sys.path:
+    sys.path.insert(0, str(ETL_DIR))
+
+
+def write_text_pdf(path: Path, lines: list[str]) -> Path:
+    """Écrit un PDF minimal d'une page (Helvetica, une ligne de texte par entrée)."""
+    def esc(s: str) -> str:
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    text = " T* ".join(f"({esc(line)}) Tj" for line in lines)
+    content = f"BT /F1 10 Tf 14 TL 40 800 Td {text} ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Fabrique de PDF texte dans le répertoire temporaire du test."""
+    return lambda name, lines: write_text_pdf(tmp_path / name, lines)
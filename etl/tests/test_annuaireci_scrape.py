@@ -0,0 +1,21 @@
+"""Tests de l'extraction de la période sur les pages annuaireci."""
+from annuaireci_scrape import parse_annuaireci
+
+PAGE = """<html><head>
+  <title>Semaine du 01/01/2026 au 07/01/2026 - Annuaire CI</title>
+  <meta name="description" content="Semaine du 08/01/2026 au 14/01/2026">
+</head><body>
+  <aside><p>A lire : Semaine du 15/01/2026 au 21/01/2026</p></aside>
+  <script>var teaser = "Semaine du 22/01/2026 au 28/01/2026";</script>
+  <h2>Pharmacies de garde : Semaine du <b>07/02/2026</b> au 13/02/2026</h2>
+  <h2>Liste des pharmacies de garde</h2>
+  <h3>COCODY</h3>
+  <h4>PHARMACIE DU LYCEE</h4>
+  <p>Rue des jardins</p>
+</body></html>"""
+
+
+def test_week_range_comes_from_headings_not_earlier_mentions():
+    data = parse_annuaireci(PAGE)
+
+    assert (data["week_start"], data["week_end"]) == ("2026-02-07", "2026-02-13")
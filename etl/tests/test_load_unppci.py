@@ -0,0 +1,180 @@
+"""Tests de load_unppci_to_supabase (client Supabase simulé, sans réseau)."""
+from types import SimpleNamespace
+
+import pytest
+
+from load_unppci_to_supabase import fetch_ingested_urls
+
+# Valeur par défaut de max-rows sur Supabase : PostgREST tronque au-delà
+POSTGREST_MAX_ROWS = 1000
+
+
+class _FakeQuery:
+    """Sous-ensemble du query builder postgrest : select/eq/in_/limit/execute."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._limit = POSTGREST_MAX_ROWS
+
+    def select(self, _cols):
+        return self
+
+    def eq(self, col, value):
+        self._rows = [r for r in self._rows if r[col] == value]
+        return self
+
+    def in_(self, col, values):
+        self._rows = [r for r in self._rows if r[col] in values]
+        return self
+
+    def limit(self, n):
+        self._limit = min(n, POSTGREST_MAX_ROWS)
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self._rows[: self._limit])
+
+
+class _FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, _name):
+        return _FakeQuery(list(self.rows))
+
+
+def _duty_rows(url, n):
+    return [{"id": f"{url}#{i}", "source": "unppci", "source_url": url} for i in range(n)]
+
+
+def test_fetch_ingested_urls_beyond_postgrest_max_rows():
+    # Plus de 1000 lignes au total : les PDF dont les lignes tombent après la
+    # coupure doivent quand même être vus comme ingérés.
+    rows = (
+        _duty_rows("https://unppci.org/a.pdf", 1500)
+        + _duty_rows("https://unppci.org/b.pdf", 800)
+        + _duty_rows("https://unppci.org/d.pdf", 5)
+        + [{"id": "x", "source": "annuaireci", "source_url": "https://unppci.org/c.pdf"}]
+    )
+    sb = _FakeSupabase(rows)
+    urls = [f"https://unppci.org/{name}.pdf" for name in "abcde"]
+
+    assert fetch_ingested_urls(sb, urls) == {
+        "https://unppci.org/a.pdf",
+        "https://unppci.org/b.pdf",
+        "https://unppci.org/d.pdf",
+    }
+
+
+def test_fetch_ingested_urls_error_means_not_ingested():
+    class _Broken:
+        def table(self, _name):
+            raise RuntimeError("réseau indisponible")
+
+    assert fetch_ingested_urls(_Broken(), ["https://unppci.org/a.pdf"]) == set()
+    assert fetch_ingested_urls(_Broken(), []) == set()
+
+
+def test_article_scan_respects_article_workers(monkeypatch):
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import load_unppci_to_supabase as loader
+
+    # Multiple de ARTICLE_WORKERS : chaque vague remplit exactement la barrière
+    articles = [SimpleNamespace(id=i) for i in range(2 * loader.ARTICLE_WORKERS)]
+    # Ne se débloque que si ARTICLE_WORKERS scans tournent en même temps ;
+    # sinon BrokenBarrierError au bout du timeout
+    barrier = threading.Barrier(loader.ARTICLE_WORKERS, timeout=5)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fake_scan(_art, *, use_cache):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        barrier.wait()
+        with lock:
+            state["running"] -= 1
+        return []
+
+    monkeypatch.setattr(loader, "discover_articles", lambda **_kw: articles)
+    monkeypatch.setattr(loader, "discover_pdfs_from_article", fake_scan)
+
+    async def run():
+        # Exécuteur par défaut plus large que ARTICLE_WORKERS (il peut n'avoir
+        # que cpu+4 threads) : seul le sémaphore doit limiter la concurrence
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=len(articles))
+        )
+        return await loader._discover_and_download_async(
+            use_cache=False, current_month_only=False, max_articles=len(articles),
+        )
+
+    result = asyncio.run(run())
+
+    assert result == ([], 0)
+    assert state["peak"] <= loader.ARTICLE_WORKERS
+
+
+def _pdf_doc(name):
+    return SimpleNamespace(label=name, url=f"https://unppci.org/uploads/{name}")
+
+
+def test_download_and_parse_counts_parse_failures(monkeypatch, make_pdf, tmp_path):
+    import asyncio
+
+    import load_unppci_to_supabase as loader
+
+    good = make_pdf("good.pdf", [
+        "SEMAINE DU SAMEDI 07 AU VENDREDI 13 FEVRIER 2026",
+        "COCODY",
+        "PHCIE DU LYCEE / DR KONE",
+    ])
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"pas un PDF")
+    paths = {"good.pdf": good, "broken.pdf": broken}
+    monkeypatch.setattr(loader, "discover_download_pdf", lambda pdf, use_cache: paths[pdf.label])
+
+    results, failures = asyncio.run(loader._download_and_parse_all(
+        [_pdf_doc("broken.pdf"), _pdf_doc("good.pdf")], use_cache=False,
+    ))
+
+    assert failures == 1
+    assert [r["path"] for r in results] == [good]
+
+
+def test_download_error_cancels_parse_consumers(monkeypatch):
+    import asyncio
+
+    import load_unppci_to_supabase as loader
+
+    def boom(_pdf, *, use_cache):
+        raise RuntimeError("téléchargement impossible")
+
+    monkeypatch.setattr(loader, "discover_download_pdf", boom)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await loader._download_and_parse_all([_pdf_doc("a.pdf")], use_cache=False)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+
+
+def test_main_exits_non_zero_when_a_pdf_failed_to_parse(monkeypatch, tmp_path):
+    import sys
+
+    import load_unppci_to_supabase as loader
+
+    payload = {"source": "unppci", "weeks": []}
+    results = [{"pdf": _pdf_doc("good.pdf"), "path": tmp_path / "good.pdf", "payload": payload}]
+    monkeypatch.setattr(loader, "discover_and_download", lambda **_kw: (results, 1))
+    monkeypatch.setattr(loader.write_dry_run, "__defaults__", (tmp_path / "dry_run.json",))
+    monkeypatch.setattr(sys, "argv", ["load_unppci_to_supabase.py", "--dry-run"])
+
+    with pytest.raises(SystemExit) as exc:
+        loader.main()
+    assert exc.value.code == 1
+    assert (tmp_path / "dry_run.json").exists()
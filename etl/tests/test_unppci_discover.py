@@ -0,0 +1,43 @@
+"""Tests des extractions regex de unppci_discover (HTML brut, sans réseau)."""
+from unppci_discover import A_HREF_RE, NEXT_PAGE_RE, _extract_pdfs_from_html
+
+PAGE_URL = "https://unppci.org/index.php?page=article&id=42"
+
+
+def test_a_href_ignores_prefixed_href_attributes():
+    html = b'<a data-href="/x/a.pdf" href="/uploads/b.pdf">PDF</a>'
+    assert A_HREF_RE.findall(html) == [b"/uploads/b.pdf"]
+
+    html = b'<a xlink:href="/x/a.pdf" class="l" HREF=\'/uploads/c.pdf\'>PDF</a>'
+    assert A_HREF_RE.findall(html) == [b"/uploads/c.pdf"]
+
+
+def test_next_page_ignores_prefixed_href_attributes():
+    html = b"<a data-href=\"/x\" href=\"/index.php?page=2\"><span>Plus d'articles</span></a>"
+    m = NEXT_PAGE_RE.search(html)
+    assert m is not None
+    assert m.group(1) == b"/index.php?page=2"
+
+
+def test_banner_pdf_with_data_href_is_excluded():
+    html = (
+        b"<html><body>"
+        b'<marquee><a data-href="/x/a.pdf" href="/uploads/banniere.pdf">Banniere</a></marquee>'
+        b'<div class="article"><a href="/uploads/garde_fevrier.pdf">Garde</a></div>'
+        b"</body></html>"
+    )
+    urls = {p.url for p in _extract_pdfs_from_html(html, PAGE_URL)}
+
+    assert "https://unppci.org/uploads/garde_fevrier.pdf" in urls
+    assert "https://unppci.org/uploads/banniere.pdf" not in urls
+
+
+def test_banner_only_page_returns_no_pdf():
+    html = (
+        b"<html><body>"
+        b'<marquee><a href="/uploads/banniere.pdf">Banniere</a>'
+        b"<a onclick=\"window.open('controllers/downloads.php?id=7')\">Tarifs</a></marquee>"
+        b"<div class=\"article\"><p>Communique sans piece jointe.</p></div>"
+        b"</body></html>"
+    )
+    assert _extract_pdfs_from_html(html, PAGE_URL) == []
@@ -0,0 +1,84 @@
+"""Tests du mode --batch de unppci_parse_pdf (PDF générés à la volée)."""
+import json
+import sys
+
+import pytest
+
+import unppci_parse_pdf
+from unppci_parse_pdf import run_batch
+
+GARDE_LINES = [
+    "SEMAINE DU SAMEDI 07 AU VENDREDI 13 FEVRIER 2026",
+    "COCODY",
+    "PHCIE DU LYCEE / DR KONE",
+    "RUE DES JARDINS 27 22 44 55 66",
+]
+
+
+def _run_main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["unppci_parse_pdf.py", *argv])
+    with pytest.raises(SystemExit) as exc:
+        unppci_parse_pdf.main()
+    return exc.value.code
+
+
+def test_run_batch_writes_json_next_to_each_pdf(make_pdf):
+    pdfs = [make_pdf("a.pdf", GARDE_LINES), make_pdf("b.pdf", GARDE_LINES)]
+
+    assert run_batch(pdfs, workers=2) == 0
+
+    for pdf in pdfs:
+        payload = json.loads(pdf.with_suffix(".json").read_text(encoding="utf-8"))
+        assert payload["source_file"] == pdf.name
+        (week,) = payload["weeks"]
+        assert (week["week_start"], week["week_end"]) == ("2026-02-07", "2026-02-13")
+        (area,) = week["areas"]
+        assert area["area"] == "COCODY"
+        assert area["pharmacies"] == [{
+            "name_raw": "DU LYCEE",
+            "address_raw": "RUE DES JARDINS",
+            "phones_raw": ["2722445566"],
+        }]
+
+
+def test_run_batch_counts_failures_without_stopping(make_pdf, tmp_path):
+    good = make_pdf("good.pdf", GARDE_LINES)
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"pas un PDF")
+
+    assert run_batch([broken, good], workers=2) == 1
+    assert good.with_suffix(".json").exists()
+    assert not broken.with_suffix(".json").exists()
+
+
+def test_main_batch_exit_codes(monkeypatch, make_pdf, tmp_path):
+    make_pdf("good.pdf", GARDE_LINES)
+    assert _run_main(monkeypatch, "--batch", str(tmp_path)) == 0
+
+    (tmp_path / "broken.pdf").write_bytes(b"pas un PDF")
+    assert _run_main(monkeypatch, "--batch", str(tmp_path)) == 1
+
+    assert _run_main(monkeypatch, "--batch", str(tmp_path / "vide")) == 1
+
+
+@pytest.mark.parametrize("extra", [
+    ["--output", "out.json"],
+    ["--source-url", "https://unppci.org/x.pdf"],
+    ["--workers", "2"],
+])
+def test_main_batch_rejects_single_pdf_options(monkeypatch, tmp_path, capsys, extra):
+    assert _run_main(monkeypatch, "--batch", str(tmp_path), *extra) == 2
+    assert "--batch est incompatible avec " + extra[0] in capsys.readouterr().err
+
+
+def test_parse_workers_inherit_parent_logging(monkeypatch):
+    import logging
+    from concurrent.futures import ProcessPoolExecutor
+
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "level", logging.WARNING)
+    with ProcessPoolExecutor(max_workers=1, **unppci_parse_pdf.worker_pool_kwargs()) as pool:
+        level = pool.submit(root.getEffectiveLevel).result()
+        has_handlers = pool.submit(root.hasHandlers).result()
+    assert level == logging.WARNING
+    assert has_handlers
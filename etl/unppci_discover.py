@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
+import html as html_lib
+import itertools
+import json
 import logging
+import os
 import re
 import sys
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup, Tag
+import urllib3
+from bs4 import BeautifulSoup, FeatureNotFound
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -33,6 +40,9 @@ UNPPCI_ARTICLES_CAT = "https://www.unppci.org/?cat=1&rw=actualites"
 CACHE_DIR = SCRIPT_DIR / ".cache_unppci"
 DOWNLOAD_DIR = SCRIPT_DIR / "downloads_unppci"
 
+# Taille des blocs lus/écrits lors du téléchargement d'un PDF
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 # Regex pour les PDF dans /uploads/
 PDF_RE = re.compile(r"/uploads/.*\.pdf", re.IGNORECASE)
 
@@ -46,6 +56,32 @@ ONCLICK_DL_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Pré-filtre sur le HTML brut (bannière <marquee> retirée : ses PDF sont sur
+# toutes les pages) : toute référence exploitable par les méthodes
+# d'extraction contient « .pdf » ou « downloads.php?id= »
+PDF_HINT_RE = re.compile(rb"\.pdf|downloads\.php\?id=\d", re.IGNORECASE)
+
+# Attributs (hors href/onclick) pouvant porter l'URL d'un PDF (méthode 4),
+# et le sélecteur CSS correspondant, évalué en une passe par soupsieve
+PDF_ATTRS = (
+    "src", "data", "data-pdf", "data-url", "data-src",
+    "data-href", "data-file", "data-link", "value", "content",
+)
+PDF_ATTR_SELECTOR = ", ".join(f'[{a}*=".pdf" i]' for a in PDF_ATTRS)
+
+# Contenu des bannières <marquee> et href des <a> qu'elles contiennent (HTML brut).
+# `(?<![-\w:])href` : l'attribut href lui-même, pas data-href ni xlink:href
+MARQUEE_RE = re.compile(rb"<marquee\b.*?</marquee>", re.IGNORECASE | re.DOTALL)
+A_HREF_RE = re.compile(rb"""<a\b[^>]*?(?<![-\w:])href\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+# Lien de pagination « Plus d'articles » (sur le HTML brut, texte éventuellement
+# entrecoupé de balises ; on ne sort pas du <a>)
+NEXT_PAGE_RE = re.compile(
+    rb"""<a\b[^>]*?(?<![-\w:])href\s*=\s*["']([^"']+)["'][^>]*>"""
+    rb"""(?:(?!</a>).)*?plus d(?:(?!</a>).)*?article""",
+    re.IGNORECASE | re.DOTALL,
+)
+
 # Regex pour les liens d'articles UNPPCI
 ARTICLE_ID_RE = re.compile(r"[?&]id=(\d+)")
 
@@ -55,6 +91,18 @@ GARDE_KEYWORDS_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Parser HTML : lxml (extension C) si disponible, sinon html.parser (pur Python)
+HTML_PARSER = "lxml"
+
+# Articles scannés en parallèle (limite pour ne pas surcharger unppci.org)
+ARTICLE_WORKERS = 5
+
+# Téléchargements de PDF simultanés (session partagée, voir _get_dl_session)
+DOWNLOAD_WORKERS = 4
+
+# Connexions HTTP gardées par hôte (au-dessus des pools de threads ci-dessus)
+HTTP_POOL_SIZE = 20
+
 # Noms des mois en français (index 1-12)
 MOIS_FR = [
     "", "JANVIER", "FEVRIER", "MARS", "AVRIL", "MAI", "JUIN",
@@ -75,6 +123,21 @@ def get_current_year() -> int:
     return date.today().year
 
 
+@functools.lru_cache(maxsize=4)
+def _get_month_patterns(mois: str, annee: str) -> Tuple[re.Pattern, re.Pattern]:
+    """Patterns attendus dans le label (insensible à la casse), compilés une fois.
+
+    "GARDE FEVRIER 2026" et "GARDE INTERIEUR FEVRIER 2026"
+    """
+    pattern_principal = re.compile(
+        rf"^\s*GARDE\s+{mois}\s+{annee}\s*$", re.IGNORECASE
+    )
+    pattern_interieur = re.compile(
+        rf"^\s*GARDE\s+INTERIEUR\s+{mois}\s+{annee}\s*$", re.IGNORECASE
+    )
+    return pattern_principal, pattern_interieur
+
+
 def filter_pdfs_current_month(pdfs: List[PdfDoc]) -> List[PdfDoc]:
     """Filtre les PDF pour ne garder que les 2 du mois courant.
 
@@ -86,15 +149,7 @@ def filter_pdfs_current_month(pdfs: List[PdfDoc]) -> List[PdfDoc]:
     """
     mois = get_current_month_label()
     annee = str(get_current_year())
-
-    # Patterns attendus dans le label (insensible à la casse)
-    # "GARDE FEVRIER 2026" et "GARDE INTERIEUR FEVRIER 2026"
-    pattern_principal = re.compile(
-        rf"^\s*GARDE\s+{mois}\s+{annee}\s*$", re.IGNORECASE
-    )
-    pattern_interieur = re.compile(
-        rf"^\s*GARDE\s+INTERIEUR\s+{mois}\s+{annee}\s*$", re.IGNORECASE
-    )
+    pattern_principal, pattern_interieur = _get_month_patterns(mois, annee)
 
     matched: List[PdfDoc] = []
     for pdf in pdfs:
@@ -151,7 +206,13 @@ def _build_session(*, verify_ssl: bool = True) -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET"],
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    # pool_maxsize ≥ nombre de threads : pas de connexion jetée sous concurrence
+    adapter = HTTPAdapter(
+        max_retries=retries,
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        pool_block=False,
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
@@ -168,27 +229,95 @@ def _get_session() -> requests.Session:
     return _session
 
 
+_dl_session: Optional[requests.Session] = None
+
+
+def _get_dl_session() -> requests.Session:
+    """Retourne la session partagée dédiée aux téléchargements de PDF (singleton).
+
+    SSL désactivé car le serveur UNPPCI coupe fréquemment la connexion SSL
+    lors du téléchargement de fichiers. Partagée entre les PDF pour réutiliser
+    les connexions (pas de nouvelle poignée de main TLS par fichier).
+    """
+    global _dl_session
+    if _dl_session is None:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _dl_session = _build_session(verify_ssl=False)
+    return _dl_session
+
+
+# ---------------------------------------------------------------------------
+# Construction du DOM
+# ---------------------------------------------------------------------------
+def make_soup(html: bytes) -> BeautifulSoup:
+    """Parse le HTML avec lxml, repli sur html.parser si lxml est absent.
+
+    Le HTML est passé en octets : le décodage UTF-8 (forcé, le site est servi
+    en UTF-8) est fait par BeautifulSoup, sans copie str intermédiaire.
+    """
+    try:
+        return BeautifulSoup(html, features=HTML_PARSER, from_encoding="utf-8")
+    except FeatureNotFound:
+        logger.debug("Parser '%s' indisponible, repli sur html.parser", HTML_PARSER)
+        return BeautifulSoup(html, "html.parser", from_encoding="utf-8")
+
+
 # ---------------------------------------------------------------------------
 # Cache
 # ---------------------------------------------------------------------------
-def _cache_path(url: str, ext: str = "html") -> Path:
-    """Chemin de cache pour une URL donnée, par jour."""
-    url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()[:12]
-    today = date.today().isoformat()
-    return CACHE_DIR / f"{today}_{url_hash}.{ext}"
+def _cache_paths(url: str) -> Tuple[Path, Path]:
+    """Retourne (corps HTML, métadonnées) du cache pour une URL (basé sur un hash)."""
+    url_hash = hashlib.blake2b(url.encode("utf-8"), digest_size=6).hexdigest()
+    return CACHE_DIR / f"{url_hash}.html", CACHE_DIR / f"{url_hash}.meta.json"
+
+
+def _read_http_meta(meta_path: Path) -> Dict[str, str]:
+    """Lit les validateurs HTTP (ETag, Last-Modified) stockés à côté d'un fichier."""
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _http_validators(r: requests.Response) -> Dict[str, str]:
+    """Extrait les validateurs HTTP d'une réponse pour un GET conditionnel futur."""
+    return {
+        "etag": r.headers.get("ETag", ""),
+        "last_modified": r.headers.get("Last-Modified", ""),
+    }
+
+
+def _write_http_meta(meta_path: Path, meta: Dict[str, str]) -> None:
+    """Enregistre les métadonnées (validateurs HTTP, date de fetch) d'un fichier."""
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
 
 
 # ---------------------------------------------------------------------------
 # Fetch HTML
 # ---------------------------------------------------------------------------
-def fetch_html(url: str, *, use_cache: bool = False) -> str:
-    """Récupère le HTML avec retry et cache optionnel."""
+def fetch_html(url: str, *, use_cache: bool = False) -> bytes:
+    """Récupère le HTML (octets bruts, UTF-8) avec retry et cache optionnel.
+
+    Avec le cache, une copie récupérée aujourd'hui est réutilisée telle quelle ;
+    une copie plus ancienne est revalidée par GET conditionnel
+    (If-None-Match / If-Modified-Since) : un 304 évite de re-télécharger la page.
+    """
+    today = date.today().isoformat()
+    cond_headers: Dict[str, str] = {}
+    meta: Dict[str, str] = {}
+
     if use_cache:
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        p = _cache_path(url)
-        if p.exists():
-            logger.debug("Cache hit : %s", p.name)
-            return p.read_text(encoding="utf-8")
+        cached, meta_path = _cache_paths(url)
+        if cached.exists():
+            meta = _read_http_meta(meta_path)
+            if meta.get("fetched_on") == today:
+                logger.debug("Cache hit : %s", cached.name)
+                return cached.read_bytes()
+            if meta.get("etag"):
+                cond_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                cond_headers["If-Modified-Since"] = meta["last_modified"]
 
     session = _get_session()
     logger.debug("GET %s", url)
@@ -200,15 +329,23 @@ def fetch_html(url: str, *, use_cache: bool = False) -> str:
                 "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
             ),
             "Accept-Language": "fr-FR,fr;q=0.9",
+            **cond_headers,
         },
         timeout=30,
     )
+
+    if r.status_code == 304 and cond_headers:
+        logger.debug("304 Not Modified : cache revalidé %s", cached.name)
+        meta["fetched_on"] = today
+        _write_http_meta(meta_path, meta)
+        return cached.read_bytes()
+
     r.raise_for_status()
-    html = r.content.decode("utf-8", errors="replace")
+    html = r.content
 
     if use_cache:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        _cache_path(url).write_text(html, encoding="utf-8")
+        cached.write_bytes(html)
+        _write_http_meta(meta_path, {**_http_validators(r), "fetched_on": today})
 
     return html
 
@@ -241,7 +378,7 @@ def discover_articles(
         page += 1
         logger.info("Scan articles page %d : %s", page, current_url)
         html = fetch_html(current_url, use_cache=use_cache)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
 
         # Extraire les liens d'articles
         for a_tag in soup.find_all("a", href=True):
@@ -266,13 +403,13 @@ def discover_articles(
                 )
 
         # Chercher le lien de pagination "Plus d'articles"
-        next_url = None
-        for link in soup.find_all("a", href=True):
-            link_text = link.get_text(strip=True).lower()
-            if "plus d" in link_text and "article" in link_text:
-                next_url = urljoin(UNPPCI_BASE, link["href"].strip())
-                break
-        current_url = next_url
+        # (regex sur le HTML brut : pas de second parcours du DOM)
+        m = NEXT_PAGE_RE.search(html)
+        if m:
+            next_href = html_lib.unescape(m.group(1).decode("utf-8", errors="replace"))
+            current_url = urljoin(UNPPCI_BASE, next_href.strip())
+        else:
+            current_url = None
 
     # Trier par id décroissant (plus récent en premier)
     result = sorted(articles.values(), key=lambda a: a.id, reverse=True)
@@ -292,7 +429,7 @@ def discover_articles(
 # Phase 2 : Extraire les PDF d'un article (href + JavaScript)
 # ---------------------------------------------------------------------------
 def _extract_pdfs_from_html(
-    html: str,
+    html: bytes,
     page_url: str,
     article: Optional[Article] = None,
 ) -> List[PdfDoc]:
@@ -303,16 +440,22 @@ def _extract_pdfs_from_html(
     2. Les attributs href des balises <a> pointant vers /uploads/*.pdf
     3. Les URLs PDF dans le JavaScript embarqué
     4. Les data-attributes contenant des URLs PDF
+
+    Une page sans aucune référence PDF hors bannière n'est pas parsée.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    if not PDF_HINT_RE.search(MARQUEE_RE.sub(b"", html)):
+        return []
+
+    soup = make_soup(html)
     found: Dict[str, PdfDoc] = {}
 
     # Identifier les PDF de la bannière (marquee) pour les exclure —
     # ils apparaissent sur toutes les pages et ne sont pas liés à l'article.
+    # Repérés par regex sur le HTML brut : pas de parcours imbriqué du DOM.
     banner_urls: set[str] = set()
-    for marquee in soup.find_all("marquee"):
-        for a_tag in marquee.find_all("a", href=True):
-            href = a_tag["href"].strip()
+    for body in MARQUEE_RE.findall(html):
+        for raw_href in A_HREF_RE.findall(body):
+            href = html_lib.unescape(raw_href.decode("utf-8", errors="replace")).strip()
             if PDF_RE.search(href):
                 banner_urls.add(urljoin(page_url, href))
 
@@ -325,24 +468,30 @@ def _extract_pdfs_from_html(
                 article_title=article.title if article else None,
             )
 
-    # --- Méthode 1 (prioritaire) : onclick="window.open('controllers/downloads.php?id=972')" ---
-    for a_tag in soup.find_all("a", onclick=True):
-        onclick = a_tag["onclick"]
-        m = ONCLICK_DL_RE.search(onclick)
+    # --- Méthodes 1 et 2 : un seul parcours des <a>, résultats ajoutés
+    #     ensuite dans l'ordre de priorité (onclick avant href) ---
+    onclick_links: List[Tuple[str, str]] = []
+    href_links: List[Tuple[str, str]] = []
+    for a_tag in soup.find_all("a"):
+        onclick = a_tag.get("onclick")
+        href = a_tag.get("href")
+        m = ONCLICK_DL_RE.search(onclick) if onclick else None
+        is_pdf_href = href is not None and PDF_RE.search(href.strip())
+        if not m and not is_pdf_href:
+            continue
+        text = " ".join(a_tag.get_text(" ", strip=True).split())
+        # Méthode 1 (prioritaire) : onclick="window.open('controllers/downloads.php?id=972')"
         if m:
-            dl_path = m.group(1)
-            full = urljoin(page_url, dl_path)
-            label = " ".join(a_tag.get_text(" ", strip=True).split()) or "pdf (download)"
-            _add(full, label)
-            logger.debug("    PDF via onclick : %s → %s", label, full)
-
-    # --- Méthode 2 : liens <a href="...pdf"> (hors bannière) ---
-    for a_tag in soup.find_all("a", href=True):
-        href = a_tag["href"].strip()
-        if PDF_RE.search(href):
-            full = urljoin(page_url, href)
-            label = " ".join(a_tag.get_text(" ", strip=True).split()) or "pdf"
-            _add(full, label)
+            onclick_links.append((urljoin(page_url, m.group(1)), text or "pdf (download)"))
+        # Méthode 2 : liens <a href="...pdf"> (hors bannière)
+        if is_pdf_href:
+            href_links.append((urljoin(page_url, href.strip()), text or "pdf"))
+
+    for full, label in onclick_links:
+        _add(full, label)
+        logger.debug("    PDF via onclick : %s → %s", label, full)
+    for full, label in href_links:
+        _add(full, label)
 
     # --- Méthode 3 : URLs PDF dans les blocs <script> ---
     for script in soup.find_all("script"):
@@ -352,10 +501,9 @@ def _extract_pdfs_from_html(
                 _add(pdf_url, "pdf (via JS)")
 
     # --- Méthode 4 : data-attributes contenant des URLs PDF ---
-    for tag in soup.find_all(True):
-        for attr_name, attr_val in (tag.attrs or {}).items():
-            if attr_name in ("href", "onclick"):
-                continue  # déjà traité
+    for tag in soup.select(PDF_ATTR_SELECTOR):
+        for attr_name in PDF_ATTRS:
+            attr_val = tag.get(attr_name)
             if isinstance(attr_val, str) and PDF_RE.search(attr_val):
                 pdf_url = urljoin(page_url, attr_val)
                 label = " ".join(tag.get_text(" ", strip=True).split()) or f"pdf ({attr_name})"
@@ -403,12 +551,12 @@ def download_pdf(pdf: PdfDoc, *, use_cache: bool = False) -> Optional[Path]:
     DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
     # Nom de fichier basé sur l'URL
-    url_path = urlparse(pdf.url).path
-    filename = Path(url_path).name or "unknown.pdf"
+    parsed = urlparse(pdf.url)
+    filename = Path(parsed.path).name or "unknown.pdf"
 
     # Pour les downloads.php?id=XXX, utiliser l'id comme nom
-    if "downloads.php" in pdf.url:
-        qs = parse_qs(urlparse(pdf.url).query)
+    if "downloads.php" in parsed.path:
+        qs = parse_qs(parsed.query)
         dl_id = qs.get("id", ["unknown"])[0]
         # Utiliser le label nettoyé comme nom de fichier
         safe_label = re.sub(r"[^\w\s-]", "", pdf.label).strip().replace(" ", "_")
@@ -420,45 +568,69 @@ def download_pdf(pdf: PdfDoc, *, use_cache: bool = False) -> Optional[Path]:
     else:
         dest = DOWNLOAD_DIR / filename
 
-    # Cache : ne pas re-télécharger si le fichier existe déjà
+    # Cache : si le fichier existe déjà, revalidation par GET conditionnel
+    # (ETag / Last-Modified) quand le serveur en a fourni ; sinon réutilisation.
+    meta_path = dest.with_name(dest.name + ".meta.json")
+    cond_headers: Dict[str, str] = {}
     if use_cache and dest.exists() and dest.stat().st_size > 0:
-        logger.debug("  PDF déjà téléchargé : %s", dest.name)
-        return dest
-
-    # Session dédiée au téléchargement : SSL désactivé car le serveur UNPPCI
-    # coupe fréquemment la connexion SSL lors du téléchargement de fichiers.
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    dl_session = _build_session(verify_ssl=False)
-
+        meta = _read_http_meta(meta_path)
+        if meta.get("etag"):
+            cond_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cond_headers["If-Modified-Since"] = meta["last_modified"]
+        if not cond_headers:
+            logger.debug("  PDF déjà téléchargé : %s", dest.name)
+            return dest
+
+    dl_session = _get_dl_session()
+
+    # Écriture en flux dans un fichier .part, renommé atomiquement à la fin :
+    # mémoire bornée à un chunk, et jamais de PDF tronqué sous le nom final.
+    tmp = dest.with_name(dest.name + ".part")
     try:
         logger.info("  Téléchargement : %s", pdf.url)
-        r = dl_session.get(
+        with dl_session.get(
             pdf.url,
+            stream=True,
             timeout=120,
             headers={
                 "User-Agent": (
                     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                     "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
                 ),
+                **cond_headers,
             },
-        )
-        r.raise_for_status()
-
-        # Vérifier que c'est bien un PDF (ou au minimum du contenu binaire)
-        content_type = r.headers.get("Content-Type", "")
-        is_pdf = "pdf" in content_type.lower() or r.content[:5] == b"%PDF-"
-        is_binary = "octet-stream" in content_type.lower() or len(r.content) > 1000
-
+        ) as r:
+            if r.status_code == 304 and cond_headers:
+                logger.debug("  PDF inchangé (304) : %s", dest.name)
+                return dest
+            r.raise_for_status()
+
+            # Vérifier que c'est bien un PDF (ou au minimum du contenu binaire)
+            content_type = r.headers.get("Content-Type", "")
+            body = r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            first = next(body, b"")
+            is_pdf = "pdf" in content_type.lower() or first[:5] == b"%PDF-"
+
+            size = 0
+            with open(tmp, "wb") as f:
+                for chunk in itertools.chain((first,), body):
+                    f.write(chunk)
+                    size += len(chunk)
+
+        is_binary = "octet-stream" in content_type.lower() or size > 1000
         if not is_pdf and not is_binary:
-            logger.warning("  ⚠ Pas un PDF (%s, %d octets) : %s", content_type, len(r.content), pdf.url)
+            tmp.unlink(missing_ok=True)
+            logger.warning("  ⚠ Pas un PDF (%s, %d octets) : %s", content_type, size, pdf.url)
             return None
 
-        dest.write_bytes(r.content)
-        logger.info("  ✅ Sauvegardé : %s (%.1f Ko)", dest.name, len(r.content) / 1024)
+        os.replace(tmp, dest)
+        _write_http_meta(meta_path, _http_validators(r))
+        logger.info("  ✅ Sauvegardé : %s (%.1f Ko)", dest.name, size / 1024)
         return dest
 
     except Exception as exc:
+        tmp.unlink(missing_ok=True)
         logger.error("  Erreur téléchargement %s : %s", pdf.url, exc)
         return None
 
@@ -507,12 +679,18 @@ def run_discovery(
     for a in articles:
         logger.info("  #%d : %s", a.id, a.title)
 
-    # 2) Extraire les PDF de chaque article
+    # 2) Extraire les PDF de chaque article (requêtes en parallèle ;
+    #    map conserve l'ordre des articles, la dédup reste séquentielle)
     all_pdfs: List[PdfDoc] = []
     seen_urls: set[str] = set()
 
-    for article in articles:
-        pdfs = discover_pdfs_from_article(article, use_cache=use_cache)
+    with ThreadPoolExecutor(max_workers=ARTICLE_WORKERS) as pool:
+        pdfs_per_article = list(pool.map(
+            lambda a: discover_pdfs_from_article(a, use_cache=use_cache),
+            articles,
+        ))
+
+    for pdfs in pdfs_per_article:
         for pdf in pdfs:
             if garde_only and not pdf.is_garde:
                 continue
@@ -529,8 +707,8 @@ def run_discovery(
     # 4) Télécharger si demandé
     if download and all_pdfs:
         logger.info("Téléchargement des PDF...")
-        for pdf in all_pdfs:
-            download_pdf(pdf, use_cache=use_cache)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            list(pool.map(lambda p: download_pdf(p, use_cache=use_cache), all_pdfs))
 
     elapsed = time.monotonic() - t_start
     logger.info("Terminé en %.1fs — %d PDF découverts", elapsed, len(all_pdfs))
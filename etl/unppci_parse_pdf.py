@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
+import multiprocessing
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pdfplumber
 
@@ -20,6 +24,40 @@ logger = logging.getLogger("unppci_parse_pdf")
 # Constantes
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = Path(__file__).resolve().parent
+DOWNLOAD_DIR = SCRIPT_DIR / "downloads_unppci"
+
+# Mode --batch : un processus par PDF, jusqu'au nombre de cœurs
+BATCH_WORKERS = os.cpu_count() or 1
+
+# Démarrage des processus workers : jamais "fork" (défaut Linux), qui copie
+# un processus dont d'autres threads peuvent tenir des verrous (logging,
+# pools urllib3, SSL) et risque un interblocage. "forkserver" si disponible,
+# sinon "spawn" (Windows).
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _init_worker_logging(level: int, fmt: Optional[str], datefmt: Optional[str]) -> None:
+    """Initializer des workers : reprend le niveau et le format du parent."""
+    logging.basicConfig(level=level, format=fmt, datefmt=datefmt, stream=sys.stderr)
+
+
+def worker_pool_kwargs() -> Dict[str, Any]:
+    """Arguments communs des ProcessPoolExecutor de parsing.
+
+    Un worker forkserver/spawn démarre sans configuration logging : sans
+    initializer, les logs INFO émis pendant le parsing seraient perdus.
+    """
+    root = logging.getLogger()
+    formatter = root.handlers[0].formatter if root.handlers else None
+    fmt = formatter._fmt if formatter else logging.BASIC_FORMAT
+    datefmt = formatter.datefmt if formatter else None
+    return {
+        "mp_context": MP_CONTEXT,
+        "initializer": _init_worker_logging,
+        "initargs": (root.level, fmt, datefmt),
+    }
 
 # Caractères accentués fréquents dans les PDF UNPPCI
 _ACC = r"A-ZÉÈÊËÂÀÎÏÔÖÛÜÇ"
@@ -39,42 +77,24 @@ _ACC = r"A-ZÉÈÊËÂÀÎÏÔÖÛÜÇ"
 #   "SEMAINE DU SAMEDI 02 MARS 2019 AU VENDREDI 08 MARS 2019"
 #   → jour_debut, mois_debut, année_debut, jour_fin, mois_fin, année_fin
 
-WEEK_RE_A = re.compile(
-    r"SEMAINE\s+DU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour début (groupe 1)
-    r"AU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour fin (groupe 2)
-    rf"([{_ACC}]+)\s+"              # mois partagé (groupe 3)
-    r"(\d{4})",                     # année partagée (groupe 4)
-    re.IGNORECASE,
-)
-
-WEEK_RE_B = re.compile(
-    r"SEMAINE\s+DU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour début (groupe 1)
-    rf"([{_ACC}]+)\s+"              # mois début (groupe 2)
-    r"AU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour fin (groupe 3)
-    rf"([{_ACC}]+)\s+"              # mois fin (groupe 4)
-    r"(\d{4})",                     # année partagée (groupe 5)
-    re.IGNORECASE,
-)
+_WEEKDAY = rf"(?:[{_ACC}]+\s+)?"   # jour de la semaine (optionnel)
+_MONTH = rf"[{_ACC}]+"
 
-WEEK_RE_C = re.compile(
-    r"SEMAINE\s+DU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour début (groupe 1)
-    rf"([{_ACC}]+)\s+"              # mois début (groupe 2)
-    r"(\d{4})\s+"                   # année début (groupe 3)
-    r"AU\s+"
-    rf"(?:[{_ACC}]+\s+)?"           # jour de la semaine (optionnel)
-    r"(\d{1,2})\s+"                 # jour fin (groupe 4)
-    rf"([{_ACC}]+)\s+"              # mois fin (groupe 5)
-    r"(\d{4})",                     # année fin (groupe 6)
+# Les 3 formats fusionnés en une seule alternation (un seul passage du moteur
+# par ligne). À une même position, l'ordre C → B → A est celui des essais :
+# du plus spécifique au plus général.
+WEEK_RE = re.compile(
+    r"SEMAINE\s+DU\s+(?:"
+    # Format C : DD MOIS ANNEE AU DD MOIS ANNEE
+    rf"{_WEEKDAY}(?P<c_d1>\d{{1,2}})\s+(?P<c_m1>{_MONTH})\s+(?P<c_y1>\d{{4}})\s+AU\s+"
+    rf"{_WEEKDAY}(?P<c_d2>\d{{1,2}})\s+(?P<c_m2>{_MONTH})\s+(?P<c_y2>\d{{4}})"
+    # Format B : DD MOIS AU DD MOIS ANNEE
+    rf"|{_WEEKDAY}(?P<b_d1>\d{{1,2}})\s+(?P<b_m1>{_MONTH})\s+AU\s+"
+    rf"{_WEEKDAY}(?P<b_d2>\d{{1,2}})\s+(?P<b_m2>{_MONTH})\s+(?P<b_y>\d{{4}})"
+    # Format A : DD AU DD MOIS ANNEE
+    rf"|{_WEEKDAY}(?P<a_d1>\d{{1,2}})\s+AU\s+"
+    rf"{_WEEKDAY}(?P<a_d2>\d{{1,2}})\s+(?P<a_m>{_MONTH})\s+(?P<a_y>\d{{4}})"
+    r")",
     re.IGNORECASE,
 )
 
@@ -105,6 +125,21 @@ MONTHS: Dict[str, int] = {
 
 PHONE_LIKE_RE = re.compile(r"\d{2}(?:[\s./-]?\d{2}){3,}")
 
+# Regex des helpers de nettoyage (compilées une fois : appelées à chaque ligne)
+_WS_RE = re.compile(r"\s+")
+_PAGESPLIT_RE = re.compile(r"(\d)SEMAINE", re.IGNORECASE)
+_PHONE_SEP_RE = re.compile(r"[\/|,;]")
+# Tout ce qui n'est ni chiffre ni séparateur de numéros
+_NON_PHONE_CHAR_RE = re.compile(r"[^\d\/|,;]+")
+_TAIL_SEP_RE = re.compile(r"[\/|;,]\s*$")
+_HEAD_SEP_RE = re.compile(r"^\s*[\/|;,]")
+_TEL_RE = re.compile(r"\bTEL\s*[.:]\s*", re.IGNORECASE)
+# Fin du nom de pharmacie : " / ", " - ", " – " ou "TEL"
+_NAME_SEP_RE = re.compile(r"\s*[–]\s*|\s+-\s*|\s*/\s*|\bTEL\b", re.IGNORECASE)
+
+# Table de suppression des chiffres/espaces/séparateurs (_is_pure_digits_line)
+_DIGIT_TABLE = str.maketrans("", "", "0123456789 \t\n\r\f\v./-")
+
 # Mots-clés d'adresse (pour exclure des faux « noms de zone »)
 ADDRESS_KEYWORDS = frozenset([
     "ROUTE", "CARREFOUR", "AVENUE", "BD", "BOULEVARD", "FACE", "PRES",
@@ -113,6 +148,14 @@ ADDRESS_KEYWORDS = frozenset([
     "QUARTIER", "PLACE", "ROND", "ENTRE", "APRES", "APRÈS", "DEVANT",
 ])
 
+# Un mot-clé d'adresse présent comme mot entier (délimité par des caractères
+# hors [_ACC], comme un découpage en mots) : une seule passe, sans allocation
+ADDRESS_KEYWORD_RE = re.compile(
+    rf"(?<![{_ACC}])(?:"
+    + "|".join(sorted(ADDRESS_KEYWORDS, key=len, reverse=True))
+    + rf")(?![{_ACC}])"
+)
+
 # Mots-clés d'en-tête à ignorer
 HEADER_PREFIXES = ("UNION", "GARDE", "SEMAINE", "PERMANENCE", "SECTION",
                    "TOUR", "TEL", "N°", "N  ")
@@ -121,12 +164,16 @@ HEADER_PREFIXES = ("UNION", "GARDE", "SEMAINE", "PERMANENCE", "SECTION",
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=2048)
 def clean(s: str) -> str:
-    """Nettoie le texte extrait du PDF."""
+    """Nettoie le texte extrait du PDF.
+
+    Mis en cache : les en-têtes et titres de colonnes se répètent à chaque page.
+    """
     s = (s or "").replace("\xa0", " ").strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     # Corrige les concaténations de saut de page (ex: "...BUS 04SEMAINE ...")
-    s = re.sub(r"(\d)SEMAINE", r"\1 SEMAINE", s, flags=re.IGNORECASE)
+    s = _PAGESPLIT_RE.sub(r"\1 SEMAINE", s)
     return s.strip()
 
 
@@ -142,51 +189,40 @@ def _try_parse_week(line: str) -> Optional[Tuple[str, str]]:
     """Tente de parser une ligne comme un en-tête de semaine.
 
     Retourne (week_start_iso, week_end_iso) ou None.
-    Essaie les 3 formats dans l'ordre : C (le plus spécifique) → B → A.
+    Le format est identifié par le groupe nommé qui a matché (C, B ou A).
     """
+    m = WEEK_RE.search(line)
+    if not m:
+        return None
+
     # Format C : DD MOIS ANNEE AU DD MOIS ANNEE
-    mc = WEEK_RE_C.search(line)
-    if mc:
-        ws = fr_date_to_iso(mc.group(1), mc.group(2), mc.group(3))
-        we = fr_date_to_iso(mc.group(4), mc.group(5), mc.group(6))
+    if m.group("c_d1") is not None:
+        ws = fr_date_to_iso(m.group("c_d1"), m.group("c_m1"), m.group("c_y1"))
+        we = fr_date_to_iso(m.group("c_d2"), m.group("c_m2"), m.group("c_y2"))
         return ws, we
 
     # Format B : DD MOIS AU DD MOIS ANNEE
-    mb = WEEK_RE_B.search(line)
-    if mb:
-        year = mb.group(5)
-        ws = fr_date_to_iso(mb.group(1), mb.group(2), year)
-        we = fr_date_to_iso(mb.group(3), mb.group(4), year)
+    if m.group("b_d1") is not None:
+        year = m.group("b_y")
+        ws = fr_date_to_iso(m.group("b_d1"), m.group("b_m1"), year)
+        we = fr_date_to_iso(m.group("b_d2"), m.group("b_m2"), year)
         return ws, we
 
     # Format A : DD AU DD MOIS ANNEE (mois et année partagés)
-    ma = WEEK_RE_A.search(line)
-    if ma:
-        month = ma.group(3)
-        year = ma.group(4)
-        ws = fr_date_to_iso(ma.group(1), month, year)
-        we = fr_date_to_iso(ma.group(2), month, year)
-        return ws, we
-
-    return None
+    month = m.group("a_m")
+    year = m.group("a_y")
+    ws = fr_date_to_iso(m.group("a_d1"), month, year)
+    we = fr_date_to_iso(m.group("a_d2"), month, year)
+    return ws, we
 
 
 def extract_phones(text: str) -> List[str]:
     """Extrait les numéros de téléphone (8 ou 10 chiffres) depuis un texte."""
-    parts = re.split(r"[\/|,;]", text)
-    phones: List[str] = []
-    for p in parts:
-        digits = re.sub(r"\D+", "", p)
-        if len(digits) in (8, 10):
-            phones.append(digits)
+    # Un seul nettoyage de la ligne entière : après découpage sur les
+    # séparateurs, chaque morceau ne contient plus que des chiffres
+    parts = _PHONE_SEP_RE.split(_NON_PHONE_CHAR_RE.sub("", text))
     # Dédoublonnage stable
-    seen: set[str] = set()
-    out: List[str] = []
-    for x in phones:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out
+    return list(dict.fromkeys(digits for digits in parts if len(digits) in (8, 10)))
 
 
 def strip_phones_from_line(line: str) -> str:
@@ -195,19 +231,20 @@ def strip_phones_from_line(line: str) -> str:
     Retourne la partie « adresse » restante.
     """
     cleaned = PHONE_LIKE_RE.sub(" ", line)
-    cleaned = re.sub(r"[\/|;,]\s*$", "", cleaned)
-    cleaned = re.sub(r"^\s*[\/|;,]", "", cleaned)
+    cleaned = _TAIL_SEP_RE.sub("", cleaned)
+    cleaned = _HEAD_SEP_RE.sub("", cleaned)
     # Retirer aussi "TEL." / "TEL:" résiduel
-    cleaned = re.sub(r"\bTEL\s*[.:]\s*", " ", cleaned, flags=re.IGNORECASE)
+    cleaned = _TEL_RE.sub(" ", cleaned)
     return clean(cleaned)
 
 
 def _is_pure_digits_line(line: str) -> bool:
     """Vérifie si la ligne ne contient que des chiffres/espaces/séparateurs."""
-    return bool(re.fullmatch(r"[\d\s./-]+", line))
+    # Il ne doit rien rester une fois ces caractères supprimés
+    return bool(line) and not line.translate(_DIGIT_TABLE)
 
 
-def looks_like_area(line: str) -> bool:
+def looks_like_area(line: str, up: Optional[str] = None) -> bool:
     """Heuristique : détecte si une ligne est un nom de zone géographique.
 
     Critères :
@@ -216,35 +253,35 @@ def looks_like_area(line: str) -> bool:
     - Ne contient pas de mot-clé d'adresse
     - Longueur raisonnable (≤ 50 caractères)
     - N'est pas une ligne de chiffres purs (téléphones)
+
+    `up` : la ligne déjà passée en majuscules, si l'appelant l'a calculée.
     """
-    if not line:
+    # Tests du moins coûteux au plus coûteux : la plupart des lignes
+    # (pharmacies, adresses, téléphones) sont rejetées dès les premiers.
+    if not line or len(line) > 50:
         return False
 
-    up = line.upper().strip()
-
-    # Exclure les en-têtes
-    if any(up.startswith(prefix) for prefix in HEADER_PREFIXES):
-        return False
+    if up is None:
+        up = line.upper().strip()
 
-    # Exclure les lignes qui contiennent PHCIE/PHARMACIE
-    if "PHCIE" in up or "PHARMACIE" in up:
+    # Les zones dans les PDF UNPPCI sont en majuscules
+    if line != up:
         return False
 
-    # Exclure les mots-clés d'adresse
-    words = set(re.findall(rf"[{_ACC}]+", up))
-    if words & ADDRESS_KEYWORDS:
+    # Exclure les en-têtes
+    if up.startswith(HEADER_PREFIXES):
         return False
 
-    # Exclure les lignes trop longues
-    if len(line) > 50:
+    # Exclure les lignes qui contiennent PHCIE/PHARMACIE ("PH" : filtre rapide)
+    if "PH" in up and ("PHCIE" in up or "PHARMACIE" in up):
         return False
 
     # Exclure les lignes de chiffres purs (téléphones)
     if _is_pure_digits_line(line):
         return False
 
-    # Les zones dans les PDF UNPPCI sont en majuscules
-    return line == up
+    # Exclure les mots-clés d'adresse
+    return not ADDRESS_KEYWORD_RE.search(up)
 
 
 def _extract_pharmacy_name(rest: str) -> str:
@@ -253,10 +290,61 @@ def _extract_pharmacy_name(rest: str) -> str:
     Coupe avant le premier séparateur (/, -, –, TEL.).
     """
     # Couper avant " / ", " - ", " – " ou "TEL."
-    name_raw = re.split(r"\s*[–]\s*|\s+-\s*|\s*/\s*|\bTEL\b", rest, maxsplit=1, flags=re.IGNORECASE)[0]
+    name_raw = _NAME_SEP_RE.split(rest, maxsplit=1)[0]
     return clean(name_raw.strip())
 
 
+# ---------------------------------------------------------------------------
+# Extraction du texte
+# ---------------------------------------------------------------------------
+def _page_lines(page: Any) -> Iterator[str]:
+    """Lignes nettoyées d'une page pdfplumber (générateur, consommé une fois)."""
+    # extract_text() sans layout : plus fiable pour le parsing ligne par ligne
+    txt = page.extract_text() or ""
+    # Libère les objets caractères/mots de la page : seul le texte sert
+    page.close()
+    raw_lines = txt.splitlines()
+    logger.debug("  Page %d : %d lignes", page.page_number, len(raw_lines))
+    return (clean(x) for x in raw_lines)
+
+
+def _extract_pages_lines(pdf_path: str, start: int, end: int) -> List[List[str]]:
+    """Extrait les lignes des pages [start, end) (exécuté dans un processus worker).
+
+    Le PDF est rouvert dans le worker : les handles pdfminer ne se partagent
+    pas entre processus.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        # Listes matérialisées : le résultat repasse par pickle
+        return [list(_page_lines(page)) for page in pdf.pages[start:end]]
+
+
+def _iter_pages_lines(pdf_path: str, page_workers: int = 1) -> Iterator[Iterable[str]]:
+    """Produit les lignes nettoyées de chaque page, dans l'ordre des pages.
+
+    Avec `page_workers` > 1, les pages sont réparties en plages contiguës
+    entre processus (l'extraction du texte est CPU-bound et indépendante
+    d'une page à l'autre).
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+        logger.info("  Pages : %d", n_pages)
+        if page_workers <= 1 or n_pages < 2:
+            for page in pdf.pages:
+                yield _page_lines(page)
+            return
+
+    workers = min(page_workers, n_pages)
+    step = -(-n_pages // workers)  # division entière arrondie au-dessus
+    with ProcessPoolExecutor(max_workers=workers, **worker_pool_kwargs()) as pool:
+        futures = [
+            pool.submit(_extract_pages_lines, pdf_path, start, min(start + step, n_pages))
+            for start in range(0, n_pages, step)
+        ]
+        for fut in futures:
+            yield from fut.result()
+
+
 # ---------------------------------------------------------------------------
 # Parsing principal
 # ---------------------------------------------------------------------------
@@ -264,6 +352,7 @@ def parse_unppci_pdf(
     pdf_path: str,
     *,
     source_url: str = "",
+    page_workers: int = 1,
 ) -> Dict[str, Any]:
     """Parse un PDF UNPPCI et retourne un payload structuré multi-semaines.
 
@@ -276,6 +365,9 @@ def parse_unppci_pdf(
     Args:
         pdf_path: Chemin vers le fichier PDF.
         source_url: URL d'origine du PDF (pour traçabilité).
+        page_workers: Nombre de processus pour l'extraction du texte des pages
+            (1 = séquentiel ; à garder à 1 quand les PDF sont déjà parsés
+            en parallèle, comme dans load_unppci_to_supabase.py).
     """
     scraped_at = datetime.now(timezone.utc).isoformat()
     pdf_path_obj = Path(pdf_path)
@@ -292,145 +384,145 @@ def parse_unppci_pdf(
     classified = {"week": 0, "area": 0, "pharmacy": 0, "address": 0,
                   "phone": 0, "skipped": 0, "ignored_pre_week": 0}
 
-    with pdfplumber.open(pdf_path) as pdf:
-        logger.info("  Pages : %d", len(pdf.pages))
-
-        for page_num, page in enumerate(pdf.pages, 1):
-            # extract_text() sans layout : plus fiable pour le parsing ligne par ligne
-            txt = page.extract_text() or ""
-            lines = [clean(x) for x in txt.splitlines()]
-            logger.debug("  Page %d : %d lignes", page_num, len(lines))
-
-            for line in lines:
-                if not line:
-                    continue
-                total_lines += 1
-
-                # --- Détection de semaine ---
-                week_dates = _try_parse_week(line)
-                if week_dates:
-                    ws, we = week_dates
-                    # Éviter les doublons si la même semaine est répétée sur chaque page
-                    if weeks and weeks[-1]["week_start"] == ws and weeks[-1]["week_end"] == we:
-                        # Même semaine que la précédente, on continue dans le même contexte
-                        logger.debug("    [SEMAINE-REPEAT] %s → %s (page %d)", ws, we, page_num)
-                    else:
-                        current_week = {"week_start": ws, "week_end": we, "areas": []}
-                        weeks.append(current_week)
-                        current_area = None
-                        area_by_name = {}
-                        classified["week"] += 1
-                        logger.debug("    [SEMAINE] %s → %s", ws, we)
-                    continue
-
-                # Avant la première semaine, on ignore tout
-                if current_week is None:
-                    classified["ignored_pre_week"] += 1
-                    continue
-
-                # --- Lignes de section / en-tête (ignorées) ---
-                up = line.upper()
-                if up.startswith("SECTION") or up.startswith("PERMANENCE") or up.startswith("TOUR DE GARDE"):
-                    classified["skipped"] += 1
-                    continue
-
-                # --- Détection de zone géographique (format Abidjan) ---
-                if looks_like_area(line):
-                    area_name = line.upper().strip()
-                    if area_name in area_by_name:
-                        current_area = area_by_name[area_name]
+    # Extraction du texte (éventuellement répartie sur plusieurs processus),
+    # puis classification séquentielle des lignes dans l'ordre des pages
+    for page_num, lines in enumerate(_iter_pages_lines(pdf_path, page_workers), 1):
+        for line in lines:
+            if not line:
+                continue
+            total_lines += 1
+            # Majuscules calculées une fois par ligne (semaine, sections, zone)
+            up = line.upper()
+
+            # --- Détection de semaine ---
+            # (pré-filtre par sous-chaîne : la regex ne tourne que sur les en-têtes)
+            week_dates = _try_parse_week(line) if "SEMAINE" in up else None
+            if week_dates:
+                ws, we = week_dates
+                # Éviter les doublons si la même semaine est répétée sur chaque page
+                if weeks and weeks[-1]["week_start"] == ws and weeks[-1]["week_end"] == we:
+                    # Même semaine que la précédente, on continue dans le même contexte
+                    logger.debug("    [SEMAINE-REPEAT] %s → %s (page %d)", ws, we, page_num)
+                else:
+                    current_week = {"week_start": ws, "week_end": we, "areas": []}
+                    weeks.append(current_week)
+                    current_area = None
+                    area_by_name = {}
+                    classified["week"] += 1
+                    logger.debug("    [SEMAINE] %s → %s", ws, we)
+                continue
+
+            # Avant la première semaine, on ignore tout
+            if current_week is None:
+                classified["ignored_pre_week"] += 1
+                continue
+
+            # --- Lignes de section / en-tête (ignorées) ---
+            if up.startswith("SECTION") or up.startswith("PERMANENCE") or up.startswith("TOUR DE GARDE"):
+                classified["skipped"] += 1
+                continue
+
+            # --- Détection de zone géographique (format Abidjan) ---
+            if looks_like_area(line, up):
+                area_name = up
+                if area_name in area_by_name:
+                    current_area = area_by_name[area_name]
+                else:
+                    current_area = {"area": line, "pharmacies": []}
+                    current_week["areas"].append(current_area)
+                    area_by_name[area_name] = current_area
+                classified["area"] += 1
+                logger.debug("    [ZONE] %s", line)
+                continue
+
+            # --- Détection de pharmacie avec ville en préfixe (format Intérieur) ---
+            # Ex: "ABENGOUROU PHCIE DU MARCHE / MME ..."
+            # Ex: "BOUAKE PHCIE BEL AIR / M. KONE ..."
+            mcity = CITY_PHARM_RE.match(line)
+            if mcity and current_week is not None:
+                city_prefix = mcity.group(1).strip().upper()
+                rest = mcity.group(3).strip()
+
+                # Vérifier que le préfixe ressemble à un nom de ville
+                # (pas un mot trop court ou un mot-clé d'adresse)
+                if len(city_prefix) >= 3 and ADDRESS_KEYWORDS.isdisjoint(city_prefix.split()):
+                    # Créer ou réutiliser la zone
+                    if city_prefix in area_by_name:
+                        current_area = area_by_name[city_prefix]
                     else:
-                        current_area = {"area": line, "pharmacies": []}
+                        current_area = {"area": city_prefix, "pharmacies": []}
                         current_week["areas"].append(current_area)
-                        area_by_name[area_name] = current_area
-                    classified["area"] += 1
-                    logger.debug("    [ZONE] %s", line)
-                    continue
+                        area_by_name[city_prefix] = current_area
+                        logger.debug("    [ZONE-AUTO] %s", city_prefix)
 
-                # --- Détection de pharmacie avec ville en préfixe (format Intérieur) ---
-                # Ex: "ABENGOUROU PHCIE DU MARCHE / MME ..."
-                # Ex: "BOUAKE PHCIE BEL AIR / M. KONE ..."
-                mcity = CITY_PHARM_RE.match(line)
-                if mcity and current_week is not None:
-                    city_prefix = mcity.group(1).strip().upper()
-                    rest = mcity.group(3).strip()
-
-                    # Vérifier que le préfixe ressemble à un nom de ville
-                    # (pas un mot-clé d'adresse ou un mot trop court)
-                    city_words = set(city_prefix.split())
-                    if not (city_words & ADDRESS_KEYWORDS) and len(city_prefix) >= 3:
-                        # Créer ou réutiliser la zone
-                        if city_prefix in area_by_name:
-                            current_area = area_by_name[city_prefix]
-                        else:
-                            current_area = {"area": city_prefix, "pharmacies": []}
-                            current_week["areas"].append(current_area)
-                            area_by_name[city_prefix] = current_area
-                            logger.debug("    [ZONE-AUTO] %s", city_prefix)
-
-                        name_raw = _extract_pharmacy_name(rest)
-                        phones = extract_phones(line)
-
-                        current_area["pharmacies"].append({
-                            "name_raw": name_raw,
-                            "address_raw": "",
-                            "phones_raw": phones,
-                        })
-                        classified["pharmacy"] += 1
-                        logger.debug("    [PHARM-CITY] %s > %s (tél: %s)", city_prefix, name_raw, phones)
-                        continue
-
-                # --- Détection de pharmacie standard (format Abidjan) ---
-                mph = PHARM_RE.match(line)
-                if mph and current_area is not None:
-                    rest = mph.group(2).strip()
                     name_raw = _extract_pharmacy_name(rest)
-                    phones = extract_phones(line)
+                    # Le préfixe ville + PHCIE ne contient ni chiffre ni séparateur
+                    phones = extract_phones(rest)
 
                     current_area["pharmacies"].append({
                         "name_raw": name_raw,
                         "address_raw": "",
                         "phones_raw": phones,
+                        "address_parts": [],
                     })
                     classified["pharmacy"] += 1
-                    logger.debug("    [PHARMACIE] %s (tél: %s)", name_raw, phones)
+                    logger.debug("    [PHARM-CITY] %s > %s (tél: %s)", city_prefix, name_raw, phones)
                     continue
 
-                # --- Ligne d'adresse / téléphone (rattachée à la dernière pharmacie) ---
-                if current_area and current_area["pharmacies"]:
-                    last = current_area["pharmacies"][-1]
-
-                    has_phone = bool(PHONE_LIKE_RE.search(line))
-
-                    if has_phone:
-                        # Extraire les téléphones et les ajouter
-                        new_phones = extract_phones(line)
-                        for ph in new_phones:
-                            if ph not in last["phones_raw"]:
-                                last["phones_raw"].append(ph)
-                        classified["phone"] += 1
-
-                        # Extraire aussi la partie adresse résiduelle
-                        addr_part = strip_phones_from_line(line)
-                        if addr_part and not _is_pure_digits_line(addr_part):
-                            last["address_raw"] = clean(
-                                (last["address_raw"] + " " + addr_part).strip()
-                            )
-                            logger.debug("    [ADDR+TEL] addr='%s' tél=%s", addr_part, new_phones)
-                        else:
-                            logger.debug("    [TEL] %s", new_phones)
+            # --- Détection de pharmacie standard (format Abidjan) ---
+            mph = PHARM_RE.match(line)
+            if mph and current_area is not None:
+                rest = mph.group(2).strip()
+                name_raw = _extract_pharmacy_name(rest)
+                phones = extract_phones(rest)
+
+                current_area["pharmacies"].append({
+                    "name_raw": name_raw,
+                    "address_raw": "",
+                    "phones_raw": phones,
+                    "address_parts": [],
+                })
+                classified["pharmacy"] += 1
+                logger.debug("    [PHARMACIE] %s (tél: %s)", name_raw, phones)
+                continue
+
+            # --- Ligne d'adresse / téléphone (rattachée à la dernière pharmacie) ---
+            if current_area and current_area["pharmacies"]:
+                last = current_area["pharmacies"][-1]
+
+                has_phone = bool(PHONE_LIKE_RE.search(line))
+
+                if has_phone:
+                    # Extraire les téléphones et les ajouter
+                    new_phones = extract_phones(line)
+                    for ph in new_phones:
+                        if ph not in last["phones_raw"]:
+                            last["phones_raw"].append(ph)
+                    classified["phone"] += 1
+
+                    # Extraire aussi la partie adresse résiduelle
+                    addr_part = strip_phones_from_line(line)
+                    if addr_part and not _is_pure_digits_line(addr_part):
+                        last["address_parts"].append(addr_part)
+                        logger.debug("    [ADDR+TEL] addr='%s' tél=%s", addr_part, new_phones)
                     else:
-                        # Ligne d'adresse pure
-                        last["address_raw"] = clean(
-                            (last["address_raw"] + " " + line).strip()
-                        )
-                        classified["address"] += 1
-                        logger.debug("    [ADRESSE] %s", line)
-                    continue
-
-                # Ligne non classifiée
-                classified["skipped"] += 1
-                logger.debug("    [???] %s", line)
+                        logger.debug("    [TEL] %s", new_phones)
+                else:
+                    # Ligne d'adresse pure
+                    last["address_parts"].append(line)
+                    classified["address"] += 1
+                    logger.debug("    [ADRESSE] %s", line)
+                continue
+
+            # Ligne non classifiée
+            classified["skipped"] += 1
+            logger.debug("    [???] %s", line)
+
+    # --- Adresses : morceaux accumulés, assemblés une seule fois ---
+    for w in weeks:
+        for a in w["areas"]:
+            for ph in a["pharmacies"]:
+                ph["address_raw"] = clean(" ".join(ph.pop("address_parts")))
 
     # --- Statistiques ---
     total_areas = sum(len(w["areas"]) for w in weeks)
@@ -461,6 +553,37 @@ def parse_unppci_pdf(
     }
 
 
+# ---------------------------------------------------------------------------
+# Mode batch
+# ---------------------------------------------------------------------------
+def _parse_one(pdf_path: Path) -> Path:
+    """Parse un PDF et écrit `<nom>.json` à côté (exécuté dans un worker)."""
+    payload = parse_unppci_pdf(str(pdf_path))
+    out_path = pdf_path.with_suffix(".json")
+    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return out_path
+
+
+def run_batch(pdfs: List[Path], *, workers: int = BATCH_WORKERS) -> int:
+    """Parse tous les PDF en parallèle (un PDF par processus).
+
+    Un seul lancement de Python/pdfplumber pour tout le répertoire au lieu
+    d'un par fichier. Retourne le nombre d'échecs.
+    """
+    failures = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(pdfs)), **worker_pool_kwargs()) as pool:
+        futures = {pool.submit(_parse_one, pdf_path): pdf_path for pdf_path in pdfs}
+        for fut, pdf_path in futures.items():
+            try:
+                logger.info("JSON écrit : %s", fut.result())
+            except Exception as exc:
+                failures += 1
+                logger.error("Échec du parsing %s : %s", pdf_path.name, exc)
+
+    logger.info("Batch terminé : %d PDF, %d échec(s)", len(pdfs), failures)
+    return failures
+
+
 # ---------------------------------------------------------------------------
 # Point d'entrée CLI
 # ---------------------------------------------------------------------------
@@ -478,7 +601,8 @@ def main() -> None:
     )
     parser.add_argument(
         "pdf", nargs="?", default=None,
-        help="Chemin vers le PDF à parser (si omis, cherche dans downloads_unppci/)",
+        help="Chemin vers le PDF à parser (si omis, cherche dans downloads_unppci/) ; "
+             "avec --batch, répertoire des PDF",
     )
     parser.add_argument(
         "--source-url", default="",
@@ -488,15 +612,43 @@ def main() -> None:
         "--output", "-o", default=None,
         help="Fichier JSON de sortie (défaut: stdout)",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processus pour l'extraction du texte des pages (défaut: 1)",
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Parser tous les PDF du répertoire en parallèle et écrire <nom>.json à côté de chacun "
+             "(incompatible avec --output, --source-url et --workers)",
+    )
     args = parser.parse_args()
 
+    if args.batch:
+        # Options propres à un PDF unique : refusées plutôt qu'ignorées
+        conflicts = [
+            flag for flag, given in (
+                ("--output", args.output is not None),
+                ("--source-url", bool(args.source_url)),
+                ("--workers", args.workers is not None),
+            ) if given
+        ]
+        if conflicts:
+            parser.error(f"--batch est incompatible avec {', '.join(conflicts)}")
+
+        pdf_dir = Path(args.pdf) if args.pdf else DOWNLOAD_DIR
+        pdfs = sorted(pdf_dir.glob("*.pdf")) if pdf_dir.is_dir() else []
+        if not pdfs:
+            logger.error("Aucun PDF trouvé dans %s", pdf_dir)
+            sys.exit(1)
+        logger.info("Batch : %d PDF dans %s", len(pdfs), pdf_dir)
+        sys.exit(1 if run_batch(pdfs) else 0)
+
     # Trouver le PDF
     if args.pdf:
         pdf_path = Path(args.pdf)
     else:
         # Chercher le premier PDF dans downloads_unppci/
-        dl_dir = SCRIPT_DIR / "downloads_unppci"
-        pdfs = sorted(dl_dir.glob("*.pdf")) if dl_dir.exists() else []
+        pdfs = sorted(DOWNLOAD_DIR.glob("*.pdf")) if DOWNLOAD_DIR.exists() else []
         if not pdfs:
             logger.error("Aucun PDF trouvé. Spécifiez un chemin ou lancez unppci_discover.py --download")
             sys.exit(1)
@@ -508,7 +660,9 @@ def main() -> None:
         sys.exit(1)
 
     # Parser
-    payload = parse_unppci_pdf(str(pdf_path), source_url=args.source_url)
+    payload = parse_unppci_pdf(
+        str(pdf_path), source_url=args.source_url, page_workers=args.workers or 1,
+    )
 
     # Sortie JSON
     json_str = json.dumps(payload, ensure_ascii=False, indent=2)